@@ -22,13 +22,14 @@ from core.time import now_utc
 from kalshi.markets import get_kalshi_markets
 from kalshi.balance import get_kalshi_balance, get_kalshi_portfolio_value
 from kalshi.positions import get_live_positions
+from kalshi.async_client import fetch_portfolio_snapshot, shutdown as shutdown_async_client
 from positions.io import resolve_positions_file, load_positions, save_positions
 from positions.reconcile import reconcile_positions
 from positions.metrics import calculate_unrealized_pnl, get_position_summary
 from execution.positions import normalize_loaded_positions, deduplicate_positions
 from execution.settlement import realize_if_settled
 from strategy.engine import run_engine
-from risk.stop_loss import check_stop_losses
+from risk.stop_loss import check_stop_losses, has_pending_exits, on_price_update, wait_for_stop_loss_trigger
 from data_collection.oddsapi_client import collect_data_running
 from bot_logging.csv_logger import log_metrics
 from bot_logging.daily_reports import generate_daily_report
@@ -88,8 +89,10 @@ def strategy_loop_thread():
             # 3. Reconcile positions (periodically)
             if settings.PLACE_LIVE_KALSHI_ORDERS == "YES" and (loop_start - last_reconcile_ts) >= settings.RECONCILE_INTERVAL:
                 print(f"🔄 [{threading.current_thread().name}] Reconciling positions...")
+                # Balance and positions in one concurrent round-trip; the engine below reads the cached balance
+                snapshot = fetch_portfolio_snapshot(force=True)
                 with _state_lock:
-                    reconcile_positions()
+                    reconcile_positions(snapshot["positions"])
                     realize_if_settled()
                     save_positions()
                 
@@ -152,8 +155,19 @@ def strategy_loop_thread():
 
 
 def stop_loss_monitoring_thread():
-    """Stop loss monitoring thread - runs at high frequency STOP_LOSS_CHECK_INTERVAL."""
-    print(f"🛡️  Stop loss monitoring thread started (interval: {settings.STOP_LOSS_CHECK_INTERVAL}s)")
+    """Stop loss monitoring thread.
+    
+    While the WebSocket is connected, ticks that cross a stop/take level wake this
+    thread immediately and the full polling pass only runs every
+    STOP_LOSS_SAFETY_INTERVAL; otherwise, or while an exit order is resting or an
+    exit retry is pending, it polls every STOP_LOSS_CHECK_INTERVAL.
+    """
+    print(f"🛡️  Stop loss monitoring thread started (interval: {settings.STOP_LOSS_CHECK_INTERVAL}s, "
+          f"{settings.STOP_LOSS_SAFETY_INTERVAL}s while WebSocket-driven)")
+    
+    ws_client = get_websocket_client()
+    if ws_client:
+        ws_client.add_price_listener(on_price_update)
     
     while state.algorithm_running and not state.algorithm_paused:
         try:
@@ -163,23 +177,34 @@ def stop_loss_monitoring_thread():
             with _state_lock:
                 check_stop_losses()
                 save_positions()
+                exits_pending = has_pending_exits()
             
             # Sync subscriptions if positions changed (e.g., exit orders placed)
             ws_client = get_websocket_client()
             if ws_client:
                 ws_client.sync_subscriptions_sync()
             
-            # Calculate sleep time to maintain fixed interval
+            # Live ticks drive checks while connected; fall back to fast polling otherwise.
+            # Resting exits and retries only advance on a polling pass, so keep polling fast for them.
+            if ws_client and ws_client.connected and not exits_pending:
+                interval = settings.STOP_LOSS_SAFETY_INTERVAL
+            else:
+                interval = settings.STOP_LOSS_CHECK_INTERVAL
             loop_duration = time.time() - loop_start
-            sleep_time = max(0, settings.STOP_LOSS_CHECK_INTERVAL - loop_duration)
+            sleep_time = max(0, interval - loop_duration)
             
             if sleep_time > 0:
-                # Use interruptible sleep
+                # Interruptible sleep that also ends early on a threshold-crossing tick
                 sleep_end = time.time() + sleep_time
                 while time.time() < sleep_end and state.algorithm_running and not state.algorithm_paused:
-                    time.sleep(min(0.5, sleep_end - time.time()))
+                    if wait_for_stop_loss_trigger(min(0.5, sleep_end - time.time())):
+                        # Ticks can keep firing; space triggered passes at least STOP_LOSS_TRIGGER_MIN_GAP apart
+                        gap = loop_start + settings.STOP_LOSS_TRIGGER_MIN_GAP - time.time()
+                        if gap > 0:
+                            time.sleep(gap)
+                        break
             elif settings.VERBOSE:
-                print(f"⚠️ Stop loss check took {loop_duration:.2f}s (exceeds {settings.STOP_LOSS_CHECK_INTERVAL}s interval)")
+                print(f"⚠️ Stop loss check took {loop_duration:.2f}s (exceeds {interval}s interval)")
         
         except KeyboardInterrupt:
             raise
@@ -355,6 +380,9 @@ def main():
         if settings.WEBSOCKET_ENABLED:
             stop_websocket_client()
         
+        # Close the shared aiohttp session and its event loop
+        shutdown_async_client()
+        
         # Wait for threads to finish (with timeout)
         # Give threads a chance to see algorithm_running = False and exit
         time.sleep(0.5)  # Brief pause for threads to check the flag
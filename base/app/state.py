@@ -2,12 +2,24 @@
 Global application state.
 """
 
-from typing import Dict, List, Any
+from collections import defaultdict
+from typing import DefaultDict, Dict, List, Any
 from config import settings
 
 # Trading state
 capital_sim = settings.CAPITAL_SIM
 positions: List[Dict[str, Any]] = []
+# Unsettled subset of positions (id(position) -> position); settled positions stay in
+# `positions` for history, so hot paths iterate this instead. Maintained by the
+# helpers in execution.positions - go through them when adding or settling.
+active_positions: Dict[int, Dict[str, Any]] = {}
+# Running sum of entry * stake over active_positions (same maintenance rules)
+total_exposure = 0.0
+# Same sum per event_ticker, for the per-event exposure limit
+event_exposure: DefaultDict[str, float] = defaultdict(float)
+# Open positions grouped by market_ticker (market_ticker -> {id(position): position}),
+# so WebSocket price callbacks only look at the positions a tick affects
+active_by_ticker: Dict[str, Dict[int, Dict[str, Any]]] = {}
 closed_trades: List[Dict[str, Any]] = []
 wins = 0
 losses = 0
@@ -18,6 +30,15 @@ _last_balance_ts = 0.0
 _last_balance_val = settings.CAPITAL_SIM
 _last_portfolio_value_ts = 0.0
 _last_portfolio_value_val = None
+# Raw /portfolio/balance body shared by the balance and portfolio value reads
+_last_balance_payload_ts = 0.0
+_last_balance_payload = None
+
+# Live positions cache
+_last_positions_ts = 0.0
+_last_positions_val = None
+# Bytes last written to the positions file; save_positions skips identical rewrites
+_last_saved_positions = None
 
 # Session tracking
 SESSION_START_BAL = None
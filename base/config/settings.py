@@ -49,6 +49,9 @@ STRATEGY_LOOP_INTERVAL = float(os.getenv("STRATEGY_LOOP_INTERVAL", "30.0"))  # F
 
 # Stop loss monitoring timing (seconds)
 STOP_LOSS_CHECK_INTERVAL = float(os.getenv("STOP_LOSS_CHECK_INTERVAL", "2.0"))  # High-frequency stop loss checks
+STOP_LOSS_SAFETY_INTERVAL = float(os.getenv("STOP_LOSS_SAFETY_INTERVAL", "15.0"))  # Full polling pass while the WebSocket is connected (ticks trigger checks in between)
+STOP_LOSS_TRIGGER_MIN_GAP = float(os.getenv("STOP_LOSS_TRIGGER_MIN_GAP", "0.5"))  # Min seconds between tick-triggered stop loss passes
+STOP_LOSS_PARALLEL_FETCH = os.getenv("STOP_LOSS_PARALLEL_FETCH", "True").lower() == "true"  # Fetch REST fallback prices for several events concurrently (False = one at a time)
 
 # UI/Performance update timing (seconds)
 UI_UPDATE_INTERVAL = float(os.getenv("UI_UPDATE_INTERVAL", "1.0"))  # Frequent UI updates
@@ -64,6 +67,7 @@ NO_OVERLAP_SLEEP_SECS = float(os.getenv("NO_OVERLAP_SLEEP_SECS", "300.0"))
 # Data collection settings
 DATA_COLLECTION_INTERVAL = float(os.getenv("DATA_COLLECTION_INTERVAL", "60.0"))  # Legacy, not used in new architecture
 DATA_SEPARATE_BY_LEAGUE = os.getenv("DATA_SEPARATE_BY_LEAGUE", "True").lower() == "true"
+ODDS_DATA_FORMAT = os.getenv("ODDS_DATA_FORMAT", "csv").lower()  # "csv" or "parquet" (parquet requires pyarrow)
 
 # WebSocket settings
 WEBSOCKET_ENABLED = os.getenv("WEBSOCKET_ENABLED", "True").lower() == "true"
@@ -77,6 +81,7 @@ MIN_TRADING_VOLUME_PER_EVENT = int(os.getenv("MIN_TRADING_VOLUME_PER_EVENT", "0"
 # Order settings
 ORDER_FILL_TIME = float(os.getenv("ORDER_FILL_TIME", "30.0"))
 BALANCE_CACHE_SECS = float(os.getenv("BALANCE_CACHE_SECS", "10.0"))
+POSITIONS_CACHE_SECS = float(os.getenv("POSITIONS_CACHE_SECS", "2.0"))  # Reuse live positions snapshot between back-to-back orders
 
 # Strategy settings
 MIN_BET_SIZE = float(os.getenv("MIN_BET_SIZE", "1.0"))
@@ -0,0 +1,40 @@
+"""
+JSON helpers that use orjson when available.
+
+orjson parses/serializes several times faster than the stdlib json module;
+if it is not installed we fall back to stdlib json transparently.
+"""
+
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def loads(data):
+    """Parse JSON from str/bytes."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj) -> str:
+    """Serialize obj to a JSON str (e.g. for websocket text frames)."""
+    if orjson is not None:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj)
+
+
+def dumpb(obj, indent: bool = False) -> bytes:
+    """Serialize obj to UTF-8 JSON bytes (e.g. for an HTTP request body or a file).
+
+    indent=True pretty-prints with 2 spaces, like json.dump(..., indent=2).
+    """
+    if orjson is not None:
+        option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, option=option)
+    return json.dumps(obj, indent=2 if indent else None).encode()
@@ -3,6 +3,8 @@ HTTP session management for API requests.
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 SESSION = requests.Session()
 SESSION.headers.update({
@@ -10,4 +12,16 @@ SESSION.headers.update({
     "Cache-Control": "no-cache, no-store, must-revalidate",
     "Pragma": "no-cache",
     "Expires": "0",
-})
\ No newline at end of file
+    "Connection": "keep-alive",
+})
+
+# Larger keep-alive pool so polling threads reuse TLS connections instead of
+# re-handshaking when more than urllib3's default 10 are in flight. Retries
+# only apply to idempotent methods (urllib3 default), so order POSTs are never replayed.
+_ADAPTER = HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=64,
+    max_retries=Retry(total=2, backoff_factor=0.1, status_forcelist=[502, 503, 504]),
+)
+SESSION.mount("https://", _ADAPTER)
+SESSION.mount("http://", _ADAPTER)
@@ -28,12 +28,13 @@ from data_collection.kalshi_collector import KalshiCollector, CSV_COLUMNS, _mark
 from data_collection.market_matcher import MarketMatcher, parse_kalshi_ticker
 from data_collection.oddsapi_client import (
     CST,
-    fetch_odds,
-    normalize_odds_data,
+    fetch_odds_many,
+    iter_normalized,
     save_market_data,
     save_skipped_games,
 )
 from config import settings
+from core import fastjson
 
 LOCAL_TZ = pytz.timezone("US/Eastern")
 
@@ -97,19 +98,28 @@ class JoinedCollector(KalshiCollector):
         print("📡 Fetching OddsAPI data...")
         target_dates = {self.target_date}
         
-        # Fetch data for each sport
-        all_skipped = []
-        for sport_code, oddsapi_keys in settings.SPORT_KEYS.items():
-            if sport_code not in self.sports and "ALL" not in self.sports:
-                continue
+        # Support single key or list of keys (e.g. ATP = [tennis_atp_qatar, tennis_atp_dubai])
+        keys_by_sport = {
+            sport_code: oddsapi_keys if isinstance(oddsapi_keys, (list, tuple)) else [oddsapi_keys]
+            for sport_code, oddsapi_keys in settings.SPORT_KEYS.items()
+            if sport_code in self.sports or "ALL" in self.sports
+        }
 
-            # Support single key or list of keys (e.g. ATP = [tennis_atp_qatar, tennis_atp_dubai])
-            keys = oddsapi_keys if isinstance(oddsapi_keys, (list, tuple)) else [oddsapi_keys]
+        # Fetch every sport key concurrently
+        for sport_code, keys in keys_by_sport.items():
+            for oddsapi_sport_key in keys:
+                print(f"  📊 Fetching {sport_code} ({oddsapi_sport_key})...")
+        fetched = fetch_odds_many([key for keys in keys_by_sport.values() for key in keys])
+
+        # Process data for each sport
+        all_skipped = []
+        for sport_code, keys in keys_by_sport.items():
+            # One fetch timestamp per sport, shared by all of its market files
+            poll_ts = datetime.now(CST)
 
             all_games = []
             for oddsapi_sport_key in keys:
-                print(f"  📊 Fetching {sport_code} ({oddsapi_sport_key})...")
-                games = fetch_odds(oddsapi_sport_key)
+                games = fetched.get(oddsapi_sport_key)
                 if games:
                     all_games.extend(games)
 
@@ -117,10 +127,31 @@ class JoinedCollector(KalshiCollector):
                 print(f"    ⚠️ No data for {sport_code}")
                 continue
 
-            # Normalize data (merged from all tournaments)
-            rows_by_date, skipped = normalize_odds_data(sport_code, all_games, target_dates)
+            # Normalize data (merged from all tournaments) and save each market
+            # as it is produced (always append/stack with fetch_timestamp)
+            skipped_by_date = {}
+            for game_date, market_type, market_data in iter_normalized(
+                sport_code, all_games, target_dates, skipped_by_date
+            ):
+                date_dir = settings.DATA_DIR / game_date.isoformat()
+                date_dir.mkdir(parents=True, exist_ok=True)
+
+                # File naming: {sport_name}_{market_type}.csv
+                sport_name_lower = sport_code.lower()
+                filename = f"{sport_name_lower}_{market_type}.csv"
+                filepath = date_dir / filename
+
+                save_market_data(
+                    market_data,
+                    filepath,
+                    market_type,
+                    append=True,
+                    fetch_timestamp=poll_ts,
+                )
+                print(f"    💾 Saved {len(market_data)} rows to {filepath.name}")
             
-            # Save skipped games
+            # Save skipped games (all dates go to the target date's file)
+            skipped = [g for skipped_list in skipped_by_date.values() for g in skipped_list]
             if skipped:
                 skipped_dir = settings.DATA_DIR / "skipped_games"
                 skipped_dir.mkdir(parents=True, exist_ok=True)
@@ -128,40 +159,6 @@ class JoinedCollector(KalshiCollector):
                 save_skipped_games(skipped, skipped_file)
                 all_skipped.extend(skipped)
             
-            # Save data to CSV files (always append/stack with fetch_timestamp)
-            for game_date, rows in rows_by_date.items():
-                if not rows:
-                    continue
-
-                # Create date directory
-                # Ensure game_date is a date object
-                if isinstance(game_date, str):
-                    from datetime import datetime as dt
-                    game_date = dt.strptime(game_date, "%Y-%m-%d").date()
-                date_dir = settings.DATA_DIR / game_date.isoformat()
-                date_dir.mkdir(parents=True, exist_ok=True)
-
-                # Separate by market type and save (always append with timestamp)
-                import pandas as pd
-                df = pd.DataFrame(rows)
-                for market_type in df["market"].unique():
-                    market_rows = df[df["market"] == market_type]
-                    market_data = market_rows.to_dict("records")
-
-                    # File naming: {sport_name}_{market_type}.csv
-                    sport_name_lower = sport_code.lower()
-                    filename = f"{sport_name_lower}_{market_type}.csv"
-                    filepath = date_dir / filename
-
-                    save_market_data(
-                        market_data,
-                        filepath,
-                        market_type,
-                        append=True,
-                        fetch_timestamp=datetime.now(CST),
-                    )
-                    print(f"    💾 Saved {len(market_data)} rows to {filepath.name}")
-            
             print(f"    ✅ Processed {len(games)} games for {sport_code}")
         
         # Skipped games are saved to CSV, no need to print to terminal
@@ -215,7 +212,7 @@ class JoinedCollector(KalshiCollector):
     async def _process_websocket_message(self, message: str):
         """Process incoming WebSocket message and write joined data."""
         try:
-            data = json.loads(message)
+            data = fastjson.loads(message)
             msg_type = data.get("type")
 
             # Capture ticker subscription sid for incremental add_markets (update_subscription)
@@ -30,6 +30,7 @@ if str(_BASE_ROOT) not in sys.path:
 from config import settings
 from kalshi.auth import load_private_key, sign_message
 from kalshi.markets import get_kalshi_markets, format_price
+from core import fastjson
 from core.session import SESSION
 from kalshi.auth import kalshi_headers
 
@@ -110,7 +111,7 @@ def _get_markets_by_series(series_ticker: str) -> List[Dict[str, Any]]:
             
             res = SESSION.get(url, headers=headers, timeout=10)
             if res.status_code == 200:
-                data = res.json()
+                data = fastjson.loads(res.content)
                 markets = data.get("markets", [])
                 all_markets.extend(markets)
                 cursor = data.get("cursor")
@@ -335,7 +336,7 @@ class KalshiCollector:
             }
 
         try:
-            await self.ws.send(json.dumps(msg))
+            await self.ws.send(fastjson.dumps(msg))
             if add_to_existing:
                 print(f"📡 Added {len(market_tickers)} markets to subscription (sid={self._ticker_sid})")
             else:
@@ -346,7 +347,7 @@ class KalshiCollector:
     async def _process_websocket_message(self, message: str):
         """Process incoming WebSocket message."""
         try:
-            data = json.loads(message)
+            data = fastjson.loads(message)
             msg_type = data.get("type")
             
             if msg_type == "ticker":
@@ -18,6 +18,7 @@ from typing import Dict, List, Optional, Tuple, Any, Set
 from datetime import date, datetime
 from pathlib import Path
 from collections import defaultdict
+from functools import lru_cache
 import numpy as np
 from scipy.optimize import brentq
 from scipy.special import expit, logit
@@ -110,9 +111,11 @@ def ticker_to_team_name(ticker_code: str, sport: str) -> _TeamName:
     return result
 
 
+@lru_cache(maxsize=16384)
 def parse_kalshi_ticker(ticker: str) -> Optional[Dict[str, Any]]:
     """
     Parse Kalshi ticker to extract sport, market type, date, and team codes.
+    Results are cached per ticker, so callers must treat the returned dict as read-only.
     
     Examples:
         KXNCAAMBGAME-26JAN15OAKMILW-OAK -> {
@@ -335,6 +338,12 @@ def get_oddsapi_file_path(sport: str, market_type: str, event_date: date, data_d
     
     file_path = date_dir / filename
     
+    # Parquet output is a dataset directory named after the CSV file
+    if settings.ODDS_DATA_FORMAT == "parquet":
+        dataset_dir = file_path.with_suffix("")
+        if dataset_dir.is_dir():
+            return dataset_dir
+    
     # Only return if file exists (don't use "2" suffix files)
     if file_path.exists():
         return file_path
@@ -402,10 +411,10 @@ def load_oddsapi_data(
     normalize: bool = True,
     latest_fetch_only: bool = True,
 ) -> pd.DataFrame:
-    """Load OddsAPI CSV file into DataFrame.
+    """Load OddsAPI CSV file (or Parquet dataset directory) into DataFrame.
     
     Args:
-        file_path: Path to CSV file
+        file_path: Path to CSV file or Parquet dataset directory
         normalize: If True, pre-normalize team names for faster matching (default: True)
         latest_fetch_only: If True and fetch_timestamp column exists, filter to rows
             from the most recent fetch (default: True). Backwards compatible: files
@@ -415,7 +424,13 @@ def load_oddsapi_data(
         return pd.DataFrame()
 
     try:
-        df = pd.read_csv(file_path)
+        if file_path.is_dir():
+            df = pd.read_parquet(file_path)
+            # Categoricals are a storage detail; match on plain values
+            for col in df.select_dtypes(include="category").columns:
+                df[col] = df[col].astype(object)
+        else:
+            df = pd.read_csv(file_path)
 
         # Filter to latest fetch when fetch_timestamp column exists
         if latest_fetch_only and "fetch_timestamp" in df.columns and len(df) > 0:
@@ -5,10 +5,13 @@ Data is separated by league for sports, by market otherwise.
 
 import os
 import sys
+import csv
 import requests
 import pandas as pd
-from typing import Dict, List, Optional, Any, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional, Any, Set, Tuple
 from datetime import datetime, timedelta, date
+from functools import lru_cache
 import pytz
 from pathlib import Path
 
@@ -18,10 +21,33 @@ if str(_BASE_ROOT) not in sys.path:
     sys.path.insert(0, str(_BASE_ROOT))
 
 from config import settings
+from core import fastjson
 
 UTC = pytz.utc
 CST = pytz.timezone("America/Chicago")
 
+# Shared session so repeated OddsAPI polls reuse keep-alive connections
+ODDS_SESSION = requests.Session()
+
+# Max concurrent OddsAPI requests in fetch_odds_many
+ODDS_FETCH_WORKERS = 8
+
+# Bound once at import for the per-game parsing path
+_utc_localize = UTC.localize
+_cst = CST
+# datetime.fromisoformat accepts a trailing "Z" from Python 3.11 on
+_FROMISO_HANDLES_Z = sys.version_info >= (3, 11)
+
+# Missing "point" (h2h outcomes) stored as NaN so the column stays float
+_NAN = float("nan")
+
+# Columns produced by iter_normalized / normalize_odds_data (in output order)
+ODDS_COLUMNS = (
+    "sport", "league", "game_id", "start_time",
+    "bookmaker", "market", "team", "price", "point",
+    "home_team", "away_team",
+)
+
 
 def _as_cst_datetime(value) -> datetime:
     """Convert value to CST datetime."""
@@ -30,10 +56,13 @@ def _as_cst_datetime(value) -> datetime:
     if isinstance(value, datetime):
         dt = value
     else:
-        dt = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+        s = value if isinstance(value, str) else str(value)
+        if not _FROMISO_HANDLES_Z and s.endswith("Z"):
+            s = s[:-1] + "+00:00"
+        dt = datetime.fromisoformat(s)
     if dt.tzinfo is None:
-        dt = UTC.localize(dt)
-    return dt.astimezone(CST)
+        dt = _utc_localize(dt)
+    return dt.astimezone(_cst)
 
 
 def convert_to_cst(value) -> str:
@@ -41,6 +70,16 @@ def convert_to_cst(value) -> str:
     return _as_cst_datetime(value).strftime("%Y-%m-%d %H:%M:%S %Z")
 
 
+@lru_cache(maxsize=4096)
+def _parse_commence(value: str) -> Tuple[datetime, str]:
+    """Parse an OddsAPI commence_time string to (CST datetime, CST string).
+    
+    Many games on a slate share the same commence_time, so this is cached.
+    """
+    dt = _as_cst_datetime(value)
+    return dt, dt.strftime("%Y-%m-%d %H:%M:%S %Z")
+
+
 def fetch_odds(sport_key: str) -> Optional[List[Dict[str, Any]]]:
     """Fetch odds from OddsAPI for a sport."""
     if not settings.ODDS_API_KEY:
@@ -58,12 +97,12 @@ def fetch_odds(sport_key: str) -> Optional[List[Dict[str, Any]]]:
     }
 
     try:
-        resp = requests.get(url, params=params, timeout=10)
+        resp = ODDS_SESSION.get(url, params=params, timeout=10)
 
         if resp.status_code != 200:
             print(f"❌ Error fetching {sport_key}: {resp.status_code} - {resp.text[:200]}")
             return None
-        data = resp.json()
+        data = fastjson.loads(resp.content)
 
         # Debug: Log API response structure
         if settings.VERBOSE and data:
@@ -87,6 +126,19 @@ def fetch_odds(sport_key: str) -> Optional[List[Dict[str, Any]]]:
         return None
 
 
+def fetch_odds_many(sport_keys: List[str]) -> Dict[str, Optional[List[Dict[str, Any]]]]:
+    """Fetch odds for several OddsAPI sport keys concurrently.
+    
+    Returns:
+        Dict of sport_key -> fetch_odds() result
+    """
+    unique_keys = list(dict.fromkeys(sport_keys))
+    if len(unique_keys) <= 1:
+        return {key: fetch_odds(key) for key in unique_keys}
+    with ThreadPoolExecutor(max_workers=min(ODDS_FETCH_WORKERS, len(unique_keys))) as pool:
+        return dict(zip(unique_keys, pool.map(fetch_odds, unique_keys)))
+
+
 def fetch_kalshi_markets(event_ticker: Optional[str] = None) -> List[Dict[str, Any]]:
     """Fetch all active Kalshi markets, optionally filtered by event ticker."""
     from kalshi.markets import get_kalshi_markets
@@ -100,42 +152,88 @@ def fetch_kalshi_markets(event_ticker: Optional[str] = None) -> List[Dict[str, A
     return []
 
 
-def normalize_odds_data(sport_name: str, games: List[Dict[str, Any]], target_dates: set) -> Tuple[Dict[str, List[Dict[str, Any]]], List[Dict[str, Any]]]:
-    """Normalize OddsAPI data to rows organized by date and market.
+def _prefix_date(game_time: str, default: Optional[date]) -> Optional[date]:
+    """Date from a raw "YYYY-MM-DD..." string, or default if it isn't one."""
+    try:
+        return date.fromisoformat(game_time[:10])
+    except ValueError:
+        return default
+
+
+def iter_normalized(
+    sport_name: str,
+    games: List[Dict[str, Any]],
+    target_dates: set,
+    skipped_by_date: Optional[Dict[date, List[Dict[str, Any]]]] = None,
+    record_date_filtered: bool = True,
+) -> Iterator[Tuple[date, str, pd.DataFrame]]:
+    """Normalize OddsAPI data, yielding one DataFrame per (date, market).
     
-    Returns:
-        Tuple of (rows_by_date, skipped_games)
+    Outcomes are accumulated column-wise (one list per column) per market for
+    the date currently being read. OddsAPI returns games ordered by
+    commence_time, so when a game lands on a different date the open date's
+    markets are yielded and released before that game is read; only one
+    date's columns are held at a time. Games that arrive out of date order
+    reopen their date, so a (date, market) pair can be yielded more than
+    once and callers must append rather than overwrite.
+    
+    Args:
+        sport_name: Sport code used for the "sport" column
+        games: Raw OddsAPI games
+        target_dates: Dates (CST) to keep
+        skipped_by_date: Optional dict filled with game date -> list of
+            skipped game records. Games without a usable date are keyed
+            under the earliest target date.
+        record_date_filtered: If False, games outside target_dates are only
+            counted in the stats, not added to skipped_by_date (default: True)
+    
+    Yields:
+        (game_date, market_type, DataFrame with ODDS_COLUMNS)
     """
-    rows_by_date = {}
-    skipped_games = []  # Track skipped games with details
-    current_timestamp = datetime.now(CST).strftime("%Y-%m-%d %H:%M:%S %Z")
+    # Date whose markets are being accumulated: market -> column lists
+    open_date: Optional[date] = None
+    market_cols: Dict[str, Dict[str, List[Any]]] = {}
+    if skipped_by_date is None:
+        skipped_by_date = {}  # Track skipped games with details
+    current_timestamp = datetime.now(_cst).strftime("%Y-%m-%d %H:%M:%S %Z")
     
-    # Track filtering statistics
-    stats = {
-        "total_games": len(games),
-        "missing_commence_time": 0,
-        "datetime_conversion_error": 0,
-        "date_filtered": 0,
-        "no_bookmakers": 0,
-        "games_processed": 0,
-        "games_with_no_rows": 0,  # Games that passed filters but produced no data
-        "bookmakers_with_no_markets": 0,
-        "markets_with_no_outcomes": 0,
-        "outcomes_missing_price": 0,
-        "rows_created": 0
-    }
+    # Filtering statistics, counted in locals and collected into stats after the loop
+    missing_commence_time = 0
+    datetime_conversion_error = 0
+    date_filtered = 0
+    no_bookmakers = 0
+    games_processed = 0
+    games_with_no_rows = 0  # Games that passed filters but produced no data
+    bookmakers_with_no_markets = 0
+    markets_with_no_outcomes = 0
+    outcomes_missing_price = 0
+    rows_created = 0
+    _verbose = settings.VERBOSE
+
+    # Date filter: direct compare for the usual single target date, otherwise
+    # membership in a frozenset of ordinals (cheaper to hash than date objects)
+    _single_target = next(iter(target_dates)) if len(target_dates) == 1 else None
+    _target_ordinals = frozenset(d.toordinal() for d in target_dates)
+    _fallback_date = min(target_dates) if target_dates else None
+    # ISO date prefixes that can still land on a target date after conversion
+    # to CST (any UTC offset moves the date by at most one day)
+    _target_prefixes = frozenset(
+        (d + timedelta(days=offset)).isoformat() for d in target_dates for offset in (-1, 0, 1)
+    )
 
     for game in games:
-        game_time = game.get("commence_time")
-        home_team = game.get("home_team", "Unknown")
-        away_team = game.get("away_team", "Unknown")
-        game_id = game.get("id", "")
-        sport_title = game.get("sport_title", "")
-        bookmakers_count = len(game.get("bookmakers", []))
+        game_get = game.get
+        game_time = game_get("commence_time")
+        home_team = game_get("home_team", "Unknown")
+        away_team = game_get("away_team", "Unknown")
+        game_id = game_get("id", "")
+        sport_title = game_get("sport_title", "")
+        bookmakers = game_get("bookmakers", [])
+        bookmakers_count = len(bookmakers)
         
         if not game_time:
-            stats["missing_commence_time"] += 1
-            skipped_games.append({
+            missing_commence_time += 1
+            skipped_by_date.setdefault(_fallback_date, []).append({
                 "timestamp": current_timestamp,
                 "sport": sport_name,
                 "league": sport_title,
@@ -149,13 +247,40 @@ def normalize_odds_data(sport_name: str, games: List[Dict[str, Any]], target_dat
             })
 
             continue
+
+        # Cheap pre-filter on the raw "YYYY-MM-DD..." prefix so games well outside
+        # the target window skip datetime parsing entirely
+        if (
+            isinstance(game_time, str)
+            and game_time[4:5] == "-"
+            and game_time[7:8] == "-"
+            and game_time[:10] not in _target_prefixes
+        ):
+            date_filtered += 1
+            if record_date_filtered:
+                skipped_by_date.setdefault(_prefix_date(game_time, _fallback_date), []).append({
+                    "timestamp": current_timestamp,
+                    "sport": sport_name,
+                    "league": sport_title,
+                    "game_id": game_id,
+                    "home_team": home_team,
+                    "away_team": away_team,
+                    "commence_time": game_time,
+                    "skip_reason": "date_filtered",
+                    "bookmakers_count": bookmakers_count,
+                    "details": f"Game date {game_time[:10]} (UTC) not within a day of target dates {target_dates}"
+                })
+            continue
             
         try:
-            game_time_cst = _as_cst_datetime(game_time)
-            commence_time_str = convert_to_cst(game_time_cst)
+            if isinstance(game_time, str):
+                game_time_cst, commence_time_str = _parse_commence(game_time)
+            else:
+                game_time_cst = _as_cst_datetime(game_time)
+                commence_time_str = convert_to_cst(game_time_cst)
         except Exception as e:
-            stats["datetime_conversion_error"] += 1
-            skipped_games.append({
+            datetime_conversion_error += 1
+            skipped_by_date.setdefault(_fallback_date, []).append({
                 "timestamp": current_timestamp,
                 "sport": sport_name,
                 "league": sport_title,
@@ -167,31 +292,35 @@ def normalize_odds_data(sport_name: str, games: List[Dict[str, Any]], target_dat
                 "bookmakers_count": bookmakers_count,
                 "details": f"Error converting datetime: {str(e)}"
             })
-            if settings.VERBOSE:
+            if _verbose:
                 print(f"⚠️ Skipping game {home_team} vs {away_team}: datetime conversion error: {e}")
             continue
             
         game_date = game_time_cst.date()
-        if game_date not in target_dates:
-            stats["date_filtered"] += 1
-            skipped_games.append({
-                "timestamp": current_timestamp,
-                "sport": sport_name,
-                "league": sport_title,
-                "game_id": game_id,
-                "home_team": home_team,
-                "away_team": away_team,
-                "commence_time": commence_time_str,
-                "skip_reason": "date_filtered",
-                "bookmakers_count": bookmakers_count,
-                "details": f"Game date {game_date} not in target dates {target_dates}"
-            })
+        if _single_target is not None:
+            in_target = game_date == _single_target
+        else:
+            in_target = game_date.toordinal() in _target_ordinals
+        if not in_target:
+            date_filtered += 1
+            if record_date_filtered:
+                skipped_by_date.setdefault(game_date, []).append({
+                    "timestamp": current_timestamp,
+                    "sport": sport_name,
+                    "league": sport_title,
+                    "game_id": game_id,
+                    "home_team": home_team,
+                    "away_team": away_team,
+                    "commence_time": commence_time_str,
+                    "skip_reason": "date_filtered",
+                    "bookmakers_count": bookmakers_count,
+                    "details": f"Game date {game_date} not in target dates {target_dates}"
+                })
             continue
 
-        bookmakers = game.get("bookmakers", [])
         if not bookmakers:
-            stats["no_bookmakers"] += 1
-            skipped_games.append({
+            no_bookmakers += 1
+            skipped_by_date.setdefault(game_date, []).append({
                 "timestamp": current_timestamp,
                 "sport": sport_name,
                 "league": sport_title,
@@ -203,12 +332,28 @@ def normalize_odds_data(sport_name: str, games: List[Dict[str, Any]], target_dat
                 "bookmakers_count": 0,
                 "details": "Game has no bookmakers available"
             })
-            if settings.VERBOSE:
+            if _verbose:
                 print(f"⚠️ Skipping game {home_team} vs {away_team}: no bookmakers available")
             continue
         
-        stats["games_processed"] += 1
-        rows_before = stats["rows_created"]
+        games_processed += 1
+        rows_before = rows_created
+
+        # Game boundary on a new date: hand off the previous date's markets
+        # before reading this game
+        if game_date != open_date:
+            yield from _drain_market_cols(open_date, market_cols)
+            open_date = game_date
+
+        # Columns that are constant across all of this game's rows
+        game_consts = (
+            ("sport", sport_name),
+            ("league", sport_title),
+            ("game_id", game_id),
+            ("start_time", commence_time_str),
+            ("home_team", home_team),
+            ("away_team", away_team),
+        )
         
         # Count markets and outcomes for diagnostics
         total_markets = 0
@@ -216,52 +361,53 @@ def normalize_odds_data(sport_name: str, games: List[Dict[str, Any]], target_dat
         bookmaker_names = []
 
         for bookmaker in bookmakers:
+            bm_get = bookmaker.get
             book_name = bookmaker["title"]
             bookmaker_names.append(book_name)
-            markets = bookmaker.get("markets", [])
+            markets = bm_get("markets", [])
             if not markets:
-                stats["bookmakers_with_no_markets"] += 1
-                if settings.VERBOSE:
+                bookmakers_with_no_markets += 1
+                if _verbose:
                     print(f"⚠️ Bookmaker {book_name} for {home_team} vs {away_team} has no markets")
                 continue
                 
             for market in markets:
-                market_type = market.get("key")
-                outcomes = market.get("outcomes", [])
+                market_get = market.get
+                market_type = market_get("key")
+                outcomes = market_get("outcomes", [])
                 total_markets += 1
                 
                 if not outcomes:
-                    stats["markets_with_no_outcomes"] += 1
-                    if settings.VERBOSE:
+                    markets_with_no_outcomes += 1
+                    if _verbose:
                         print(f"⚠️ Market {market_type} from {book_name} for {home_team} vs {away_team} has no outcomes")
                     continue
 
-                for outcome in outcomes:
-                    price = outcome.get("price")
-                    if price is None:
-                        stats["outcomes_missing_price"] += 1
-                        continue
-                    total_outcomes += 1
-
-                    rows_by_date.setdefault(game_date, []).append({
-                        "sport": sport_name,
-                        "league": sport_title,
-                        "game_id": game_id,
-                        "start_time": commence_time_str,
-                        "bookmaker": book_name,
-                        "market": market_type,
-                        "team": outcome.get("name"),
-                        "price": outcome.get("price"),
-                        "point": outcome.get("point", None),
-                        "home_team": home_team,
-                        "away_team": away_team
-                    })
-                    stats["rows_created"] += 1
-        
+                # Flatten priced outcomes with comprehensions (one extend per column)
+                priced = [o for o in outcomes if o.get("price") is not None]
+                n = len(priced)
+                outcomes_missing_price += len(outcomes) - n
+                if not n:
+                    continue
+                total_outcomes += n
+                rows_created += n
+
+                # Column lists for this market (one list per output column)
+                cols = market_cols.get(market_type)
+                if cols is None:
+                    cols = market_cols[market_type] = {k: [] for k in ODDS_COLUMNS}
+                for col, value in game_consts:
+                    cols[col].extend([value] * n)
+                cols["bookmaker"].extend([book_name] * n)
+                cols["market"].extend([market_type] * n)
+                cols["team"].extend([o.get("name") for o in priced])
+                cols["price"].extend([o["price"] for o in priced])
+                cols["point"].extend([o.get("point", _NAN) for o in priced])
+
         # Check if this game produced any rows
-        if stats["rows_created"] == rows_before:
-            stats["games_with_no_rows"] += 1
-            skipped_games.append({
+        if rows_created == rows_before:
+            games_with_no_rows += 1
+            skipped_by_date.setdefault(game_date, []).append({
                 "timestamp": current_timestamp,
                 "sport": sport_name,
                 "league": sport_title,
@@ -276,10 +422,24 @@ def normalize_odds_data(sport_name: str, games: List[Dict[str, Any]], target_dat
                 "total_outcomes": total_outcomes,
                 "details": f"Game passed filters but produced no rows. Bookmakers: {len(bookmakers)}, Markets: {total_markets}, Outcomes: {total_outcomes}"
             })
-            if settings.VERBOSE:
+            if _verbose:
                 print(f"⚠️ Game {home_team} vs {away_team} (ID: {game_id}) passed filters but produced no rows")
                 print(f"   Bookmakers: {len(bookmakers)}, Markets per bookmaker: {[len(b.get('markets', [])) for b in bookmakers]}")
     
+    stats = {
+        "total_games": len(games),
+        "missing_commence_time": missing_commence_time,
+        "datetime_conversion_error": datetime_conversion_error,
+        "date_filtered": date_filtered,
+        "no_bookmakers": no_bookmakers,
+        "games_processed": games_processed,
+        "games_with_no_rows": games_with_no_rows,
+        "bookmakers_with_no_markets": bookmakers_with_no_markets,
+        "markets_with_no_outcomes": markets_with_no_outcomes,
+        "outcomes_missing_price": outcomes_missing_price,
+        "rows_created": rows_created,
+    }
+
     # Print summary statistics
     if stats["total_games"] > 0:
         print(f"📊 OddsAPI filtering stats for {sport_name}:")
@@ -303,52 +463,134 @@ def normalize_odds_data(sport_name: str, games: List[Dict[str, Any]], target_dat
         if stats["outcomes_missing_price"] > 0:
             print(f"   ⚠️ Outcomes missing price: {stats['outcomes_missing_price']}")
 
-    return rows_by_date, skipped_games
+    yield from _drain_market_cols(open_date, market_cols)
 
 
-def save_skipped_games(skipped_games: List[Dict[str, Any]], filepath: Path):
-    """Save skipped games to CSV file."""
-    if not skipped_games:
-        return
-    
-    os.makedirs(filepath.parent, exist_ok=True)
-    df = pd.DataFrame(skipped_games)
+def _drain_market_cols(
+    game_date: Optional[date], market_cols: Dict[str, Dict[str, List[Any]]]
+) -> Iterator[Tuple[date, str, pd.DataFrame]]:
+    """Yield one DataFrame per market, emptying market_cols as it goes."""
+    for market_type in list(market_cols):
+        yield game_date, market_type, pd.DataFrame(market_cols.pop(market_type), copy=False)
+
+
+def normalize_odds_data(
+    sport_name: str,
+    games: List[Dict[str, Any]],
+    target_dates: set,
+    record_date_filtered: bool = True,
+) -> Tuple[Dict[date, pd.DataFrame], Dict[date, List[Dict[str, Any]]]]:
+    """Normalize OddsAPI data to rows organized by date.
     
-    # Ensure consistent column order
-    columns = [
-        "timestamp", "sport", "league", "game_id", "home_team", "away_team",
-        "commence_time", "skip_reason", "bookmakers_count", "bookmakers",
-        "total_markets", "total_outcomes", "details"
-    ]
+    Materializing wrapper around iter_normalized(); prefer that when rows can
+    be written per market as they are produced.
     
-    # Only include columns that exist in the data
-    existing_columns = [col for col in columns if col in df.columns]
-    # Add any additional columns that weren't in the list
-    for col in df.columns:
-        if col not in existing_columns:
-            existing_columns.append(col)
+    Returns:
+        Tuple of (rows_by_date, skipped_by_date) where rows_by_date maps
+        game date -> DataFrame with ODDS_COLUMNS and skipped_by_date maps
+        game date -> list of skipped game records.
+    """
+    skipped_by_date: Dict[date, List[Dict[str, Any]]] = {}
+    frames_by_date: Dict[date, List[pd.DataFrame]] = {}
+    for game_date, _market_type, df in iter_normalized(
+        sport_name, games, target_dates, skipped_by_date, record_date_filtered
+    ):
+        frames_by_date.setdefault(game_date, []).append(df)
+    rows_by_date = {
+        game_date: frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True)
+        for game_date, frames in frames_by_date.items()
+    }
+    return rows_by_date, skipped_by_date
+
+
+# Low-cardinality columns stored as categoricals (dictionary-encoded) in Parquet output
+PARQUET_CATEGORY_COLUMNS = ("sport", "league", "bookmaker", "market", "team", "home_team", "away_team")
+
+
+def odds_dataset_dir(filepath: Path) -> Path:
+    """Parquet dataset directory used in place of a {key}.csv file."""
+    return filepath.with_suffix("")
+
+
+def _save_market_parquet(df: pd.DataFrame, filepath: Path, fetch_timestamp: datetime):
+    """Write one fetch as a new part file of the {key}/ Parquet dataset.
     
-    df = df[existing_columns]
+    Each fetch gets its own part file, so earlier fetches are never rewritten.
+    """
+    dataset_dir = odds_dataset_dir(filepath)
+    dataset_dir.mkdir(parents=True, exist_ok=True)
+    for col in PARQUET_CATEGORY_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype("category")
+    part_name = f"part-{fetch_timestamp.astimezone(CST).strftime('%Y%m%dT%H%M%S%f')}.parquet"
+    df.to_parquet(dataset_dir / part_name, engine="pyarrow", compression="zstd", index=False)
+
+
+# Column order for skipped games CSV files
+SKIPPED_COLUMNS = [
+    "timestamp", "sport", "league", "game_id", "home_team", "away_team",
+    "commence_time", "skip_reason", "bookmakers_count", "bookmakers",
+    "total_markets", "total_outcomes", "details"
+]
+
+
+def _append_csv(df: pd.DataFrame, filepath: Path):
+    """Append DataFrame rows to a CSV file without re-reading it.
     
-    # Append to existing file if it exists
-    if filepath.exists():
+    Only the header line of an existing file is read. If its columns differ
+    from df's (e.g. a file written by an older schema), the file is rewritten
+    once with the combined columns; after that every call is a pure append.
+    """
+    if filepath.exists() and filepath.stat().st_size > 0:
+        with open(filepath, newline="") as f:
+            existing_header = next(csv.reader(f), [])
+        if existing_header == list(df.columns):
+            df.to_csv(filepath, mode="a", header=False, index=False)
+            return
         try:
             df_existing = pd.read_csv(filepath)
-            df_combined = pd.concat([df_existing, df], ignore_index=True)
-            # Remove duplicates based on game_id and timestamp
-            df_combined = df_combined.drop_duplicates(subset=["game_id", "timestamp"], keep="last")  # type: ignore
-            df_combined.to_csv(filepath, index=False)
+            columns = list(df.columns) + [col for col in df_existing.columns if col not in df.columns]
+            df = pd.concat([df_existing, df], ignore_index=True)[columns]
         except Exception as e:
-            # If append fails, just overwrite
+            # If the existing file can't be read, just overwrite
             if settings.VERBOSE:
                 print(f"⚠️ Failed to append to {filepath}: {e}, overwriting instead")
-            df.to_csv(filepath, index=False)
-    else:
-        df.to_csv(filepath, index=False)
+    df.to_csv(filepath, index=False)
+
+
+def save_skipped_games(skipped_games: List[Dict[str, Any]], filepath: Path):
+    """Append skipped games to CSV file, skipping (game_id, timestamp) duplicates.
+    
+    Timestamps are per poll, so duplicates can only occur within one batch;
+    rows are deduped against the batch itself and the file is never re-read.
+    """
+    if not skipped_games:
+        return
+    
+    os.makedirs(filepath.parent, exist_ok=True)
+    
+    seen: Set[Tuple[str, str]] = set()
+    new_rows = []
+    for row in skipped_games:
+        key = (str(row.get("game_id", "")), str(row.get("timestamp", "")))
+        if key in seen:
+            continue
+        seen.add(key)
+        new_rows.append(row)
+    if not new_rows:
+        return
+    
+    df = pd.DataFrame(new_rows)
+    
+    # Use the full column set so appended rows always line up with the header
+    columns = SKIPPED_COLUMNS + [col for col in df.columns if col not in SKIPPED_COLUMNS]
+    df = df.reindex(columns=columns)
+    
+    _append_csv(df, filepath)
 
 
 def save_market_data(
-    data: List[Dict[str, Any]],
+    data: pd.DataFrame,
     filepath: Path,
     market_type: Optional[str] = None,
     append: bool = True,
@@ -356,14 +598,17 @@ def save_market_data(
 ):
     """Save market data to CSV file.
     
+    With ODDS_DATA_FORMAT="parquet" the rows are written as a part file of the
+    Parquet dataset directory next to filepath (see odds_dataset_dir) instead.
+    
     Args:
-        data: List of dictionaries to save
+        data: DataFrame of normalized rows (ODDS_COLUMNS) to save
         filepath: Path to CSV file
         market_type: Optional market type (for logging)
         append: If True and file exists, append data (default: True)
         fetch_timestamp: Timestamp for this fetch (default: now in CST). Stored as ISO string.
     """
-    if not data:
+    if data.empty:
         return
 
     if fetch_timestamp is None:
@@ -371,10 +616,9 @@ def save_market_data(
     ts_str = fetch_timestamp.astimezone(CST).isoformat()
 
     os.makedirs(filepath.parent, exist_ok=True)
-    df_new = pd.DataFrame(data)
 
-    # Add fetch_timestamp to each row
-    df_new["fetch_timestamp"] = ts_str
+    # Add fetch_timestamp to each row (assign returns a new frame, leaving data untouched)
+    df_new = data.assign(fetch_timestamp=ts_str)
 
     columns = [
         "sport", "league", "game_id", "start_time",
@@ -386,17 +630,13 @@ def save_market_data(
     existing_columns = [col for col in columns if col in df_new.columns]
     df_new = df_new[existing_columns]
 
-    # Append to existing file if it exists and append=True (stack without deduplication)
-    if append and filepath.exists():
-        try:
-            df_existing = pd.read_csv(filepath)
-            df_combined = pd.concat([df_existing, df_new], ignore_index=True)
-            df_combined.to_csv(filepath, index=False)
-        except Exception as e:
-            # If append fails, just overwrite
-            if settings.VERBOSE:
-                print(f"⚠️ Failed to append to {filepath}: {e}, overwriting instead")
-            df_new.to_csv(filepath, index=False)
+    if settings.ODDS_DATA_FORMAT == "parquet":
+        _save_market_parquet(df_new, filepath, fetch_timestamp)
+        return
+
+    # Append to existing file if append=True (stack without deduplication)
+    if append:
+        _append_csv(df_new, filepath)
     else:
         df_new.to_csv(filepath, index=False)
 
@@ -409,7 +649,7 @@ def collect_data_running(output_dir: Optional[Path] = None, target_date: Optiona
         target_date: Optional target date (default: today)
     
     Returns:
-        Dictionary with collected data organized by league/market.
+        Dictionary of DataFrames organized by league/market.
     """
     if target_date is None:
         target_date = datetime.now(CST).date()
@@ -423,93 +663,82 @@ def collect_data_running(output_dir: Optional[Path] = None, target_date: Optiona
     collected_data = {}
 
     # Collect from OddsAPI (sports data by league)
-    all_skipped_games = []  # Collect all skipped games across sports
+    all_skipped_by_date: Dict[date, List[Dict[str, Any]]] = {}  # Skipped games across sports
+    # Market frames to write, flushed once per file after all sports are fetched:
+    # filepath -> (market_type, fetch_timestamp, frames)
+    pending: Dict[Path, Tuple[str, datetime, List[pd.DataFrame]]] = {}
     
-    for sport_name, oddsapi_keys in settings.SPORT_KEYS.items():
-        # Support single key or list of keys (e.g. ATP = [tennis_atp_qatar, tennis_atp_dubai])
-        keys = oddsapi_keys if isinstance(oddsapi_keys, (list, tuple)) else [oddsapi_keys]
+    # Support single key or list of keys (e.g. ATP = [tennis_atp_qatar, tennis_atp_dubai])
+    keys_by_sport = {
+        sport_name: oddsapi_keys if isinstance(oddsapi_keys, (list, tuple)) else [oddsapi_keys]
+        for sport_name, oddsapi_keys in settings.SPORT_KEYS.items()
+    }
 
-        all_data = []
+    # Fetch every sport key concurrently, then process sports in order
+    for sport_name, keys in keys_by_sport.items():
         for sport_key in keys:
             print(f"📡 Fetching odds for {sport_name} ({sport_key})...")
-            data = fetch_odds(sport_key)
+    fetched = fetch_odds_many([key for keys in keys_by_sport.values() for key in keys])
+
+    for sport_name, keys in keys_by_sport.items():
+        # One fetch timestamp per sport, shared by all of its market files
+        poll_ts = datetime.now(CST)
+
+        all_data = []
+        for sport_key in keys:
+            data = fetched.get(sport_key)
             if data:
                 all_data.extend(data)
 
         if not all_data:
             continue
 
-        rows_by_date, skipped_games = normalize_odds_data(sport_name, all_data, target_dates)
-
-        all_skipped_games.extend(skipped_games)
-
-        for game_date, rows in rows_by_date.items():
+        # Only target-date skipped games are written below, so don't build
+        # records for games the date filter drops
+        for game_date, market_type, market_data in iter_normalized(
+            sport_name, all_data, target_dates, all_skipped_by_date, record_date_filtered=False
+        ):
             # Only process rows for the target date, not tomorrow
             if game_date != target_date:
                 continue
 
-            if not rows:
-                continue
-
-            # Separate by market type
-            df = pd.DataFrame(rows)
-            for market_type in df["market"].unique():
-                market_data = df[df["market"] == market_type].to_dict("records")  # type: ignore
-
-                # Use sport name only (not sport_league) for filename
-                key = f"{sport_name}_{market_type}"
-                
-                if key not in collected_data:
-                    collected_data[key] = []
-                collected_data[key].extend(market_data)
-
-                # Save to file (only for the target date, not tomorrow)
-                filename = f"{key.lower()}.csv"
-                filepath = output_dir / filename
-
-                save_market_data(
-                    market_data,
-                    filepath,
-                    market_type,
-                    fetch_timestamp=datetime.now(CST),
-                )
-
-        # Save skipped games to CSV (one file per day, in data_collection directory)
-        if all_skipped_games:
-            # Group skipped games by date
-            skipped_by_date = {}
-            for skipped in all_skipped_games:
-                # Try to extract date from commence_time
-                commence_time = skipped.get("commence_time", "")
-                if commence_time:
-                    try:
-                        # Parse the commence_time string to get date
-                        dt = _as_cst_datetime(commence_time)
-                        skip_date = dt.date()
-                    except:
-                        # If we can't parse, use target_date
-                        skip_date = target_date
-                else:
-                    skip_date = target_date
-                
-                skipped_by_date.setdefault(skip_date, []).extend([skipped])
+            # Use sport name only (not sport_league) for filename
+            key = f"{sport_name}_{market_type}"
             
-            # Save skipped games for each date in skipped_games subdirectory
-            # Only save skipped games for the target date
-            skipped_dir = output_dir.parent / "skipped_games"  # data_collection/data_curr/skipped_games
-            skipped_dir.mkdir(parents=True, exist_ok=True)
-            for skip_date, skipped_list in skipped_by_date.items():
-                # Only save skipped games for the target date
-                if skip_date == target_date:
-                    date_str = skip_date.strftime("%Y-%m-%d")
-                    skipped_filepath = skipped_dir / f"skipped_games_{date_str}.csv"
-                    save_skipped_games(skipped_list, skipped_filepath)
-                    print(f"📝 Saved {len(skipped_list)} skipped games to {skipped_filepath.name}")
+            collected_data[key] = market_data
+
+            # Queue for saving (only for the target date, not tomorrow)
+            filename = f"{key.lower()}.csv"
+            filepath = output_dir / filename
+            pending.setdefault(filepath, (market_type, poll_ts, []))[2].append(market_data)
+
+    # Flush market data: one write per file per poll
+    for filepath, (market_type, fetch_ts, frames) in pending.items():
+        save_market_data(
+            frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True),
+            filepath,
+            market_type,
+            fetch_timestamp=fetch_ts,
+        )
+
+    # Save skipped games to CSV (one file per day, in data_collection directory)
+    # Only save skipped games for the target date
+    skipped_list = all_skipped_by_date.get(target_date)
+    if skipped_list:
+        skipped_dir = output_dir.parent / "skipped_games"  # data_collection/data_curr/skipped_games
+        skipped_dir.mkdir(parents=True, exist_ok=True)
+        date_str = target_date.strftime("%Y-%m-%d")
+        skipped_filepath = skipped_dir / f"skipped_games_{date_str}.csv"
+        save_skipped_games(skipped_list, skipped_filepath)
+        print(f"📝 Saved {len(skipped_list)} skipped games to {skipped_filepath.name}")
 
     # Collect Kalshi markets (non-sports: by market)
     # This would require event ticker discovery, which is handled in the main loop
     # For now, we just log that Kalshi data collection happens during main loop
 
+    # Drop cached commence_time parses so the cache doesn't grow across days
+    _parse_commence.cache_clear()
+
     return collected_data
 
 
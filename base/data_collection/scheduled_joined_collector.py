@@ -8,16 +8,21 @@ game start to game end, rather than for all matched markets continuously.
 - Same matching process as joined_collector
 - OddsAPI fetch every 30 minutes (writes to data dir, not joined file until subscribed)
 - Websocket subscriptions only start when current_time >= oddsapi_start_time - 30 min
-- Uses intermittent checks (every 60s) to subscribe to new markets as they become eligible
+- Uses intermittent checks (every 30s) to subscribe to new markets as they become eligible,
+  coalescing tickers that open close together into one subscribe frame
 - Same directories and format as joined_collector
 """
 
 import asyncio
+import heapq
 import re
 import threading
+import time
+from functools import lru_cache
 from datetime import datetime, date, timedelta
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Set
+from typing import Dict, List, Any, Optional, Set, Tuple
+from zoneinfo import ZoneInfo
 import pytz
 
 import os
@@ -31,7 +36,6 @@ if str(_BASE_ROOT) not in sys.path:
 from data_collection.kalshi_collector import KalshiCollector, CSV_COLUMNS, _market_to_row, _parse_time
 from data_collection.market_matcher import MarketMatcher, parse_kalshi_ticker
 from data_collection.oddsapi_client import (
-    CST,
     fetch_odds,
     normalize_odds_data,
     save_market_data,
@@ -41,41 +45,66 @@ from data_collection.joined_collector import JoinedCollector, JOINED_CSV_COLUMNS
 from config import settings
 
 LOCAL_TZ = pytz.timezone("US/Eastern")
+# stdlib zoneinfo for the start-time parser / window checks (no pytz localize/normalize)
+CENTRAL_TZ = ZoneInfo("America/Chicago")
 
 # Minutes before game start when we begin subscribing
 SUBSCRIPTION_WINDOW_MINUTES = 30
 # How often to check for new markets to subscribe (seconds)
-SUBSCRIPTION_CHECK_INTERVAL = 300
+SUBSCRIPTION_CHECK_INTERVAL = 30
+# Send a batched subscribe once this many tickers are pending...
+SUBSCRIPTION_BATCH_MIN = 25
+# ...or once the oldest pending batch has waited this long (seconds)
+SUBSCRIPTION_BATCH_MAX_WAIT = 60
+# How often to print the subscription status / diagnostics when nothing was added (seconds)
+SUBSCRIPTION_REPORT_INTERVAL = 300
 
 
-def _parse_oddsapi_start_time(start_time_str: Any) -> Optional[datetime]:
-    """
-    Parse oddsapi start_time to timezone-aware datetime (Central).
-    Handles string "2026-02-07 14:30:00 CST" or pandas Timestamp/datetime.
-    """
-    if start_time_str is None or (isinstance(start_time_str, float) and str(start_time_str) == "nan"):
-        return None
-    # Handle pandas Timestamp, datetime, etc. - convert to string
-    s = str(start_time_str).strip()
-    if not s or s == "nan" or s == "NaT":
-        return None
+_TZ_SUFFIX_RE = re.compile(r"\s+[A-Z]{3,4}$")
+
+
+@lru_cache(maxsize=4096)
+def _parse_start_time_cached(s: str) -> Optional[datetime]:
+    """Parse a stripped start_time string; cached since the same game times repeat across tickers."""
+    # Fast path for the dominant OddsAPI CSV shape "YYYY-MM-DD HH:MM:SS[ TZ]" - no regex
+    n = len(s)
+    if n == 19 or (23 <= n <= 24 and s[19] == " " and s[20:].isalpha() and s[20:].isupper()):
+        if s[4] == "-" and s[7] == "-" and s[10] == " " and s[13] == ":":
+            try:
+                return datetime.fromisoformat(s[:19]).replace(tzinfo=CENTRAL_TZ)
+            except ValueError:
+                pass
     try:
         # Strip timezone suffix (CST, CDT, etc.) - interpret as America/Chicago
-        s_clean = re.sub(r"\s+[A-Z]{3,4}$", "", s)
+        s_clean = _TZ_SUFFIX_RE.sub("", s)
         # Handle pandas output like "2026-02-07 11:00:00" (no TZ suffix)
         s_clean = s_clean.strip()
         if "T" in s_clean:
             # ISO format from pandas
             parsed = datetime.fromisoformat(s_clean.replace("Z", "+00:00"))
             if parsed.tzinfo:
-                return parsed.astimezone(CST)
-            return CST.localize(parsed)
+                return parsed.astimezone(CENTRAL_TZ)
+            return parsed.replace(tzinfo=CENTRAL_TZ)
         dt_naive = datetime.strptime(s_clean, "%Y-%m-%d %H:%M:%S")
-        return CST.localize(dt_naive)
+        return dt_naive.replace(tzinfo=CENTRAL_TZ)
     except (ValueError, TypeError):
         return None
 
 
+def _parse_oddsapi_start_time(start_time_str: Any) -> Optional[datetime]:
+    """
+    Parse oddsapi start_time to timezone-aware datetime (Central).
+    Handles string "2026-02-07 14:30:00 CST" or pandas Timestamp/datetime.
+    """
+    if start_time_str is None or (isinstance(start_time_str, float) and str(start_time_str) == "nan"):
+        return None
+    # Handle pandas Timestamp, datetime, etc. - convert to string
+    s = str(start_time_str).strip()
+    if not s or s == "nan" or s == "NaT":
+        return None
+    return _parse_start_time_cached(s)
+
+
 class ScheduledJoinedCollector(JoinedCollector):
     """
     Collector that combines Kalshi and OddsAPI data, but only subscribes to
@@ -93,13 +122,21 @@ class ScheduledJoinedCollector(JoinedCollector):
 
         # ticker -> oddsapi_start_time (datetime) for matched markets
         self.ticker_start_times: Dict[str, datetime] = {}
+        # min-heap of (start_time, ticker) so each check only pops tickers whose window opened
+        self._pending_heap: List[Tuple[datetime, str]] = []
+        # eligible tickers waiting to go out in the next batched subscribe
+        self._pending_subscribe: List[str] = []
+        self._last_subscribe_batch = 0.0
         # tickers we have subscribed to via websocket
         self.subscribed_tickers: Set[str] = set()
-        self.subscribed_tickers_lock = threading.RLock()
+        self.subscribed_tickers_lock = threading.Lock()
+        # Event loop running the websocket; the subscription-check thread submits subscribes to it
+        self._main_loop: Optional[asyncio.AbstractEventLoop] = None
 
     def _build_ticker_start_times(self) -> None:
         """Build map of ticker -> oddsapi_start_time for matched markets."""
-        self.ticker_start_times.clear()
+        # Build into a fresh dict and swap it in, since the subscription-check thread reads it
+        start_times: Dict[str, datetime] = {}
         with self.markets_lock:
             for ticker, market in self.markets.items():
                 match_key = self.matcher.find_match(ticker, market)
@@ -118,64 +155,91 @@ class ScheduledJoinedCollector(JoinedCollector):
                 start_str = first_row.get("start_time")
                 dt = _parse_oddsapi_start_time(start_str)
                 if dt:
-                    self.ticker_start_times[ticker] = dt
+                    start_times[ticker] = dt
+        heap = [(st, t) for t, st in start_times.items()]
+        heapq.heapify(heap)
+        with self.subscribed_tickers_lock:
+            self.ticker_start_times = start_times
+            self._pending_heap = heap
 
-    def _get_tickers_to_subscribe(self) -> List[str]:
+    def _get_tickers_to_subscribe(
+        self, now: Optional[datetime] = None, cutoff: Optional[datetime] = None
+    ) -> List[str]:
         """
         Return list of tickers that should be subscribed but aren't yet.
         A ticker is eligible when: now >= oddsapi_start_time - 30 minutes.
+        Eligible tickers are popped from the pending heap, so callers own them
+        until they are subscribed (see _pending_subscribe).
+        Pass `now`/`cutoff` (now + window) when the caller already computed them this tick.
         """
-        now = datetime.now(CST)
-        cutoff = now + timedelta(minutes=SUBSCRIPTION_WINDOW_MINUTES)
-
-        with self.markets_lock:
-            valid_tickers = set(self.markets.keys())
-        with self.subscribed_tickers_lock:
-            already_subscribed = set(self.subscribed_tickers)
-
+        if cutoff is None:
+            if now is None:
+                now = datetime.now(CENTRAL_TZ)
+            cutoff = now + timedelta(minutes=SUBSCRIPTION_WINDOW_MINUTES)
         to_subscribe = []
-        for ticker, start_dt in self.ticker_start_times.items():
-            if ticker in already_subscribed:
-                continue
-            if ticker not in valid_tickers:
-                continue
-            # Subscribe if we're within 30 min of start (start_dt <= now + 30min)
-            if start_dt <= cutoff:
-                to_subscribe.append(ticker)
+        # A heap rebuild (OddsAPI refresh) re-adds tickers still queued in _pending_subscribe
+        queued = set(self._pending_subscribe)
+        with self.subscribed_tickers_lock, self.markets_lock:
+            heap = self._pending_heap
+            while heap and heap[0][0] <= cutoff:
+                _, ticker = heapq.heappop(heap)
+                if ticker in self.markets and ticker not in self.subscribed_tickers and ticker not in queued:
+                    to_subscribe.append(ticker)
         return to_subscribe
 
-    async def _run_subscription_check(self) -> None:
+    def _subscribe_from_thread(self, tickers: List[str], add_to_existing: bool) -> None:
+        """Run _subscribe_to_markets on the websocket's event loop and wait for it."""
+        future = asyncio.run_coroutine_threadsafe(
+            self._subscribe_to_markets(tickers, add_to_existing=add_to_existing),
+            self._main_loop,
+        )
+        future.result(timeout=30)
+
+    def _run_subscription_check(self, stop_event: threading.Event) -> None:
         """
         Periodically check for new markets that have entered the subscription
         window and subscribe to them.
+
+        Runs in its own thread (see _connection_loop) so the set algebra and
+        diagnostics never stall websocket message ingestion; only the subscribe
+        send itself is handed back to the event loop.
         """
-        while self.running:
+        last_report = 0.0
+        while self.running and not stop_event.is_set():
             try:
-                if not self.running:
-                    break
-
-                # Clean up stale tickers (markets that have closed)
-                with self.markets_lock:
-                    valid = set(self.markets.keys())
-                with self.subscribed_tickers_lock:
-                    stale = self.subscribed_tickers - valid
+                # Clean up stale tickers (markets that have closed); dict membership, no key snapshot
+                with self.subscribed_tickers_lock, self.markets_lock:
+                    markets = self.markets
+                    stale = [t for t in self.subscribed_tickers if t not in markets]
                     if stale:
-                        self.subscribed_tickers -= stale
+                        self.subscribed_tickers.difference_update(stale)
 
-                to_subscribe = self._get_tickers_to_subscribe()
+                now = datetime.now(CENTRAL_TZ)
+                cutoff = now + timedelta(minutes=SUBSCRIPTION_WINDOW_MINUTES)
+                pending = self._pending_subscribe
+                pending.extend(self._get_tickers_to_subscribe(now, cutoff))
                 added = 0
-                if to_subscribe and self.ws:
+                mono_now = time.monotonic()
+                # Coalesce tickers whose windows open close together into one subscribe frame
+                flush = pending and (
+                    len(pending) >= SUBSCRIPTION_BATCH_MIN
+                    or mono_now - self._last_subscribe_batch >= SUBSCRIPTION_BATCH_MAX_WAIT
+                )
+                if flush and self.ws:
                     try:
                         # Default to False: websockets lib may not expose "closed"; assume open
                         ws_closed = getattr(self.ws, "closed", False)
                         if not ws_closed:
+                            to_subscribe = list(pending)
+                            pending.clear()
                             with self.subscribed_tickers_lock:
                                 for t in to_subscribe:
                                     self.subscribed_tickers.add(t)
                             # Use update_subscription when we have sid; else new subscribe
-                            await self._subscribe_to_markets(
+                            self._subscribe_from_thread(
                                 to_subscribe, add_to_existing=(self._ticker_sid is not None)
                             )
+                            self._last_subscribe_batch = mono_now
                             added = len(to_subscribe)
                         else:
                             print(
@@ -184,39 +248,48 @@ class ScheduledJoinedCollector(JoinedCollector):
                             )
                     except Exception as e:
                         print(f"⚠️ Error subscribing to new markets: {e}")
-                print(f"📋 Subscription check: {added} new markets added")
+
+                if added == 0 and mono_now - last_report < SUBSCRIPTION_REPORT_INTERVAL:
+                    stop_event.wait(SUBSCRIPTION_CHECK_INTERVAL)
+                    continue
+                last_report = mono_now
+                print(f"📋 Subscription check: {added} new markets added ({len(pending)} pending batch)")
 
                 # Diagnostic when 0 added (helps debug scheduling)
                 if added == 0:
-                    if not self.ticker_start_times:
+                    start_times = self.ticker_start_times
+                    if not start_times:
                         print("   ⚠️ No markets have start times - check OddsAPI data & matching")
                     else:
-                        now = datetime.now(CST)
-                        cutoff = now + timedelta(minutes=SUBSCRIPTION_WINDOW_MINUTES)
-                        with self.markets_lock:
-                            valid = set(self.markets.keys())
-                        with self.subscribed_tickers_lock:
-                            subbed = set(self.subscribed_tickers)
-                        not_valid = sum(1 for t in self.ticker_start_times if t not in valid)
-                        already = sum(1 for t in self.ticker_start_times if t in subbed)
-                        future = sum(1 for t, st in self.ticker_start_times.items() if t in valid and t not in subbed and st > cutoff)
-                        in_window = sum(1 for t, st in self.ticker_start_times.items() if t in valid and t not in subbed and st <= cutoff)
+                        # One pass over ticker_start_times for all four counters
+                        not_valid = already = future = in_window = 0
+                        with self.subscribed_tickers_lock, self.markets_lock:
+                            valid = self.markets
+                            subbed = self.subscribed_tickers
+                            for t, st in start_times.items():
+                                if t not in valid:
+                                    not_valid += 1
+                                elif t in subbed:
+                                    already += 1
+                                elif st > cutoff:
+                                    future += 1
+                                else:
+                                    in_window += 1
                         if in_window > 0 or future > 0:
                             print(
-                                f"   📊 {len(self.ticker_start_times)} with start times | "
+                                f"   📊 {len(start_times)} with start times | "
                                 f"now={now.strftime('%H:%M')} CT cutoff={cutoff.strftime('%H:%M')} CT | "
                                 f"not_in_markets={not_valid} already_subscribed={already} "
                                 f"future={future} in_window={in_window}"
                             )
-                        if in_window > 0 and added == 0:
+                        if in_window > 0 and added == 0 and not pending:
                             print("   ⚠️ Markets in window but not subscribed - WebSocket may be disconnected")
 
-                await asyncio.sleep(SUBSCRIPTION_CHECK_INTERVAL)
+                stop_event.wait(SUBSCRIPTION_CHECK_INTERVAL)
 
-            except asyncio.CancelledError:
-                break
             except Exception as e:
                 print(f"⚠️ Error in subscription check: {e}")
+                stop_event.wait(SUBSCRIPTION_CHECK_INTERVAL)
 
     def discover_markets(self) -> int:
         """Discover markets, perform matching, and build start time map."""
@@ -265,13 +338,17 @@ class ScheduledJoinedCollector(JoinedCollector):
                     additional_headers=headers,
                     ping_interval=20,
                     ping_timeout=10,
+                    # Ticker frames are small JSON; permessage-deflate only costs CPU on recv
+                    compression=None,
                 ) as websocket:
                     self.ws = websocket
                     self._ticker_sid = None  # Reset on reconnect; captured from "subscribed" response
                     print("✅ Connected to Kalshi WebSocket")
 
                     # Add newly eligible markets, then subscribe to all (subscribed_tickers ∩ markets)
-                    newly_eligible = self._get_tickers_to_subscribe()
+                    # (include anything still waiting in the batch queue from the last connection)
+                    newly_eligible = self._pending_subscribe + self._get_tickers_to_subscribe()
+                    self._pending_subscribe.clear()
                     with self.subscribed_tickers_lock:
                         for t in newly_eligible:
                             self.subscribed_tickers.add(t)
@@ -296,8 +373,12 @@ class ScheduledJoinedCollector(JoinedCollector):
 
                     # Start REST update task
                     rest_task = asyncio.create_task(self._update_markets_via_rest())
-                    # Start subscription check task (for markets entering the window)
-                    sub_check_task = asyncio.create_task(self._run_subscription_check())
+                    # Start subscription check thread (for markets entering the window)
+                    self._main_loop = asyncio.get_running_loop()
+                    sub_check_stop = threading.Event()
+                    sub_check_task = asyncio.create_task(
+                        asyncio.to_thread(self._run_subscription_check, sub_check_stop)
+                    )
 
                     try:
                         async for message in websocket:
@@ -306,7 +387,7 @@ class ScheduledJoinedCollector(JoinedCollector):
                             await self._process_websocket_message(message)
                     finally:
                         rest_task.cancel()
-                        sub_check_task.cancel()
+                        sub_check_stop.set()
                         try:
                             await rest_task
                         except asyncio.CancelledError:
@@ -428,6 +509,16 @@ def main():
 
     args = parser.parse_args()
 
+    # uvloop (installed with uvicorn[standard] on Linux/macOS) speeds up the websocket recv loop
+    try:
+        import uvloop
+
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+        if settings.VERBOSE:
+            print("⚡ Using uvloop event loop")
+    except ImportError:
+        pass
+
     try:
         asyncio.run(main_async(args))
     except KeyboardInterrupt:
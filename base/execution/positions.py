@@ -2,39 +2,143 @@
 Position normalization and management utilities.
 """
 
-from typing import List, Dict, Any
+from collections import defaultdict
+from typing import List, Dict, Any, Set, Tuple
+
+import numpy as np
+
 from app import state
 
 
+def normalize_position(p: Dict[str, Any]) -> Dict[str, Any]:
+    """Canonicalize a position record in place (and return it).
+
+    Every record in state.positions goes through this on load, add or reconcile, so
+    readers can use p["side"] (lowercase) and p["effective_entry"] (float) directly.
+    """
+    p["side"] = (p.get("side") or "").lower()
+    entry = p.get("effective_entry")
+    if entry is None:
+        entry = p.get("entry_price", 0.0)
+    p["effective_entry"] = float(entry or 0.0)
+    p.setdefault("settled", False)
+    p.setdefault("closing_in_progress", False)
+    p.setdefault("stop_loss", None)
+    p.setdefault("take_profit", None)
+    return p
+
+
+def position_key(p: Dict[str, Any]) -> Tuple[str, str]:
+    """(market_ticker, lowercase side) identity used to match local and live positions."""
+    return p.get("market_ticker"), p["side"]
+
+
+def position_exposure(p: Dict[str, Any]) -> float:
+    """Dollars at risk in a position: entry price * contracts."""
+    return p["effective_entry"] * float(p.get("stake", 0))
+
+
+def _add_exposure(position: Dict[str, Any], amount: float):
+    state.total_exposure += amount
+    state.event_exposure[position.get("event_ticker")] += amount
+
+
+def exposure_totals(positions: List[Dict[str, Any]]) -> Tuple[float, Dict[str, float]]:
+    """(total, per-event) exposure over positions, summed as arrays rather than per record."""
+    if not positions:
+        return 0.0, defaultdict(float)
+    entries = np.fromiter((p["effective_entry"] for p in positions), dtype=np.float64, count=len(positions))
+    stakes = np.fromiter((float(p.get("stake", 0)) for p in positions), dtype=np.float64, count=len(positions))
+    exposures = entries * stakes
+    # Group by event: index each position's event, then one weighted bincount per pass
+    event_idx: Dict[str, int] = {}
+    codes = np.fromiter(
+        (event_idx.setdefault(p.get("event_ticker"), len(event_idx)) for p in positions),
+        dtype=np.intp, count=len(positions),
+    )
+    per_event = np.bincount(codes, weights=exposures, minlength=len(event_idx))
+    return float(exposures.sum()), defaultdict(float, zip(event_idx, per_event.tolist()))
+
+
+def _unindex_ticker(position: Dict[str, Any]):
+    by_id = state.active_by_ticker.get(position.get("market_ticker"))
+    if by_id is not None:
+        by_id.pop(id(position), None)
+        if not by_id:
+            state.active_by_ticker.pop(position.get("market_ticker"), None)
+
+
+def rebuild_position_index():
+    """Recompute state.active_positions, active_by_ticker and the exposure totals from state.positions (after bulk load/replace)."""
+    state.active_positions = {id(p): p for p in state.positions if not p.get("settled", False)}
+    by_ticker: Dict[str, Dict[int, Dict[str, Any]]] = {}
+    for key, p in state.active_positions.items():
+        by_ticker.setdefault(p.get("market_ticker"), {})[key] = p
+    state.active_by_ticker = by_ticker
+    state.total_exposure, state.event_exposure = exposure_totals(list(state.active_positions.values()))
+
+
+def add_position(position: Dict[str, Any]):
+    """Normalize and append a new position, indexing it if it is open."""
+    normalize_position(position)
+    state.positions.append(position)
+    if not position.get("settled", False):
+        state.active_positions[id(position)] = position
+        state.active_by_ticker.setdefault(position.get("market_ticker"), {})[id(position)] = position
+        _add_exposure(position, position_exposure(position))
+
+
+def settle_position(position: Dict[str, Any]):
+    """Mark a position settled and drop it from the open indexes."""
+    position["settled"] = True
+    if state.active_positions.pop(id(position), None) is not None:
+        _unindex_ticker(position)
+        _add_exposure(position, -position_exposure(position))
+
+
+def set_position_stake(position: Dict[str, Any], stake):
+    """Change a position's contract count, keeping the exposure totals in step."""
+    if id(position) in state.active_positions:
+        old = position_exposure(position)
+        position["stake"] = stake
+        _add_exposure(position, position_exposure(position) - old)
+    else:
+        position["stake"] = stake
+
+
+def open_positions() -> List[Dict[str, Any]]:
+    """Snapshot list of unsettled positions (safe to settle while iterating).
+
+    state.active_positions is the open partition of state.positions: every path that
+    settles a position goes through settle_position(), so no per-record check is needed.
+    """
+    return list(state.active_positions.values())
+
+
+def open_position_keys() -> Set[Tuple[str, str]]:
+    """position_key() of every unsettled position."""
+    return {position_key(p) for p in open_positions()}
+
+
 def normalize_loaded_positions():
     """Normalize loaded positions (ensure all required fields exist)."""
     for p in state.positions:
-        if "effective_entry" not in p:
-            p["effective_entry"] = p.get("entry_price", 0.0)
-        if "settled" not in p:
-            p["settled"] = False
-        if "closing_in_progress" not in p:
-            p["closing_in_progress"] = False
-        if "stop_loss" not in p:
-            p["stop_loss"] = None
-        if "take_profit" not in p:
-            p["take_profit"] = None
+        normalize_position(p)
+    rebuild_position_index()
 
 
 def deduplicate_positions():
     """Remove duplicate positions based on market_ticker and side."""
-    seen = set()
-    unique_positions = []
-    
+    unique: Dict[tuple, Dict[str, Any]] = {}
+
     for p in state.positions:
-        key = (p.get("market_ticker"), (p.get("side") or "").lower())
-        if key not in seen:
-            seen.add(key)
-            unique_positions.append(p)
+        key = position_key(p)
+        existing = unique.get(key)
+        if existing is None:
+            unique[key] = p
         else:
             # If duplicate, merge quantities (keep the one with larger stake)
-            existing = next(pos for pos in unique_positions 
-                          if (pos.get("market_ticker"), (pos.get("side") or "").lower()) == key)
             existing["stake"] = max(existing.get("stake", 0), p.get("stake", 0))
-    
-    state.positions[:] = unique_positions
\ No newline at end of file
+
+    state.positions[:] = unique.values()
+    rebuild_position_index()
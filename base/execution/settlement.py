@@ -7,7 +7,9 @@ from config import settings
 from core.time import now_utc
 from kalshi.positions import get_live_positions
 from positions.metrics import calculate_unrealized_pnl
+from kalshi.prices import yes_exit_price
 from positions.io import save_positions
+from execution.positions import open_positions, position_key, settle_position, set_position_stake
 
 
 def realize_if_settled():
@@ -18,44 +20,39 @@ def realize_if_settled():
         return
 
     try:
-        live = get_live_positions()
-        live_keys = {(lp["ticker"], (lp["side"] or "").lower()) for lp in live}
+        live = get_live_positions(force=True)
         live_dict = {(lp["ticker"], (lp["side"] or "").lower()): lp for lp in live}
     except Exception:
         return
 
-    for p in state.positions:
-        if p.get("settled", False):
-            continue
-        
+    dirty = False
+    # event_ticker -> {market_ticker: market}: one REST fetch per event for exit-price fallbacks
+    event_markets = {}
+
+    for p in open_positions():
         # Skip positions that are in closing state - they're handled elsewhere
         if p.get("closing_in_progress", False):
             continue
         
-        key = (p.get("market_ticker"), (p.get("side") or "").lower())
-        if key not in live_keys:
+        key = position_key(p)
+        if key not in live_dict:
             # Position no longer exists on Kalshi - it's been fully settled
-            p["settled"] = True
+            settle_position(p)
+            dirty = True
             p["settled_time"] = now_utc().isoformat()
             
             # Calculate realized PnL using exit price if available, otherwise use current unrealized
-            from kalshi.markets import get_kalshi_markets, format_price
             from kalshi.fees import kalshi_fee_per_contract
             
             exit_price = p.get("last_exit_price")
             if not exit_price:
                 # Try to get current price as fallback
                 try:
-                    mkts = get_kalshi_markets(p.get("event_ticker", ""), force_live=True)
-                    if mkts:
-                        m = next((m for m in mkts if m.get("ticker") == p.get("market_ticker")), None)
-                        if m:
-                            yes_bid = format_price(m.get("yes_bid"))
-                            exit_price = yes_bid if yes_bid is not None else format_price(m.get("yes_ask"))
+                    exit_price = yes_exit_price(p, None, event_markets)
                 except Exception:
                     pass
             
-            entry_price = float(p.get("effective_entry", p.get("entry_price", 0.0)))
+            entry_price = p["effective_entry"]
             stake = int(p.get("stake", 0))
             
             if exit_price and entry_price > 0 and stake > 0:
@@ -67,9 +64,9 @@ def realize_if_settled():
             else:
                 # Fallback: use unrealized PnL calculation
                 unrealized, _ = calculate_unrealized_pnl()
-                open_positions = [pos for pos in state.positions if not pos.get("settled", False)]
-                if open_positions and len(open_positions) > 0:
-                    realized_pnl = unrealized / len(open_positions)
+                open_count = len(state.active_positions)
+                if open_count:
+                    realized_pnl = unrealized / open_count
                 else:
                     realized_pnl = unrealized
             
@@ -107,6 +104,9 @@ def realize_if_settled():
                     # Position has been partially reduced - update local stake to match
                     if settings.VERBOSE:
                         print(f"📊 Adjusting position size: {p.get('market_ticker')} from {local_qty} to {live_qty} (partial exit)")
-                    p["stake"] = live_qty
+                    set_position_stake(p, live_qty)
+                    dirty = True
     
-    save_positions()
\ No newline at end of file
+    # Only persist when something changed this call
+    if dirty:
+        save_positions()
\ No newline at end of file
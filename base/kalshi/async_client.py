@@ -0,0 +1,134 @@
+"""
+Async Kalshi REST client over a shared aiohttp ClientSession.
+
+Lets independent portfolio reads (balance, portfolio value, positions) run
+concurrently instead of back-to-back on the blocking requests SESSION.
+"""
+
+import asyncio
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+from config import settings
+from kalshi.auth import kalshi_headers
+
+# Seconds to wait for a submitted snapshot before giving up on it
+SNAPSHOT_TIMEOUT = 10.0
+
+# One long-lived event loop (on a daemon thread) hosts the shared ClientSession, so
+# its pooled keep-alive connections survive across calls; see shutdown()
+_LOOP: Optional[asyncio.AbstractEventLoop] = None
+_LOOP_THREAD: Optional[threading.Thread] = None
+_LOOP_LOCK = threading.Lock()
+_SESSION = None
+
+
+def _get_loop() -> asyncio.AbstractEventLoop:
+    """Return the client's event loop, starting its thread on first use."""
+    global _LOOP, _LOOP_THREAD
+    with _LOOP_LOCK:
+        if _LOOP is None or _LOOP.is_closed():
+            _LOOP = asyncio.new_event_loop()
+            _LOOP_THREAD = threading.Thread(target=_LOOP.run_forever, daemon=True, name="KalshiAsyncClient")
+            _LOOP_THREAD.start()
+        return _LOOP
+
+
+def run_sync(coro, timeout: float = SNAPSHOT_TIMEOUT):
+    """Run a coroutine on the client's event loop from a sync thread and wait for its result."""
+    return asyncio.run_coroutine_threadsafe(coro, _get_loop()).result(timeout)
+
+
+async def get_session():
+    """Return the shared ClientSession (created lazily on the client's event loop)."""
+    global _SESSION
+    if aiohttp is None:
+        raise RuntimeError("aiohttp is not installed (pip install aiohttp)")
+    if _SESSION is None or _SESSION.closed:
+        _SESSION = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=20, keepalive_timeout=60),
+            headers={"Accept": "application/json"},
+        )
+    return _SESSION
+
+
+async def close_session():
+    """Close the shared ClientSession if one is open."""
+    global _SESSION
+    if _SESSION is not None and not _SESSION.closed:
+        await _SESSION.close()
+    _SESSION = None
+
+
+def shutdown():
+    """Close the shared session and stop the client's event loop (call once at exit)."""
+    global _LOOP, _LOOP_THREAD
+    with _LOOP_LOCK:
+        loop, thread = _LOOP, _LOOP_THREAD
+        _LOOP = _LOOP_THREAD = None
+    if loop is None or loop.is_closed():
+        return
+    try:
+        asyncio.run_coroutine_threadsafe(close_session(), loop).result(5.0)
+    except Exception as e:
+        if settings.VERBOSE:
+            print(f"⚠️ Error closing async Kalshi session: {e}")
+    loop.call_soon_threadsafe(loop.stop)
+    if thread is not None:
+        thread.join(timeout=3.0)
+    if not loop.is_running():
+        loop.close()
+
+
+async def kalshi_get(path: str, timeout: float = 8) -> Tuple[int, bytes]:
+    """Signed GET against the Kalshi REST API; returns (status, raw body)."""
+    session = await get_session()
+    headers = kalshi_headers("GET", path)
+    async with session.get(
+        settings.KALSHI_BASE_URL + path,
+        headers=headers,
+        timeout=aiohttp.ClientTimeout(total=timeout),
+    ) as res:
+        return res.status, await res.read()
+
+
+async def fetch_portfolio_snapshot_async(force: bool = False) -> Dict[str, Any]:
+    """Fetch balance, portfolio value and live positions concurrently.
+
+    Balance and portfolio value come from the same /portfolio/balance body, so
+    this is two concurrent GETs rather than three.
+    """
+    from kalshi.balance import get_kalshi_balance_and_value_async
+    from kalshi.positions import get_live_positions_async
+
+    (balance, portfolio_value), positions = await asyncio.gather(
+        get_kalshi_balance_and_value_async(force=force),
+        get_live_positions_async(),
+    )
+    return {
+        "balance": balance,
+        "portfolio_value": portfolio_value,
+        "positions": positions,
+    }
+
+
+def fetch_portfolio_snapshot(force: bool = False) -> Dict[str, Any]:
+    """Sync wrapper around fetch_portfolio_snapshot_async for the threaded bot loops.
+
+    Without aiohttp the same snapshot is fetched sequentially over the requests SESSION.
+    """
+    if aiohttp is None:
+        from kalshi.balance import get_kalshi_balance, get_kalshi_portfolio_value
+        from kalshi.positions import get_live_positions
+        return {
+            "balance": get_kalshi_balance(force=force),
+            "portfolio_value": get_kalshi_portfolio_value(),
+            "positions": get_live_positions(force=True),
+        }
+
+    return run_sync(fetch_portfolio_snapshot_async(force=force))
@@ -12,6 +12,11 @@ from config import settings
 
 _PRIVATE_KEY_CACHE = None
 
+# Padding/hash descriptors are stateless, so build them once instead of per signature
+_SHA = hashes.SHA256()
+_PSS = padding.PSS(mgf=padding.MGF1(_SHA), salt_length=padding.PSS.DIGEST_LENGTH)
+_API_KEY_ID = settings.API_KEY_ID
+
 
 def load_private_key():
     """Load and cache the Kalshi private key."""
@@ -31,25 +36,40 @@ def load_private_key():
 
 def sign_message(private_key, message):
     """Sign a message using the private key."""
-    signature = private_key.sign(
-        message.encode(),
-        padding.PSS(
-            mgf=padding.MGF1(hashes.SHA256()),
-            salt_length=padding.PSS.DIGEST_LENGTH,
-        ),
-        hashes.SHA256(),
-    )
+    signature = private_key.sign(message.encode(), _PSS, _SHA)
     return base64.b64encode(signature).decode()
 
 
-def kalshi_headers(method, path):
-    """Generate Kalshi API authentication headers."""
-    timestamp = str(int(time.time() * 1000))
+def kalshi_headers(method, path, content_type=None):
+    """Generate Kalshi API authentication headers (plus Content-Type if given)."""
+    timestamp = str(time.time_ns() // 1_000_000)
     private_key = load_private_key()
-    msg = timestamp + method + path.split("?")[0]
+    msg = timestamp + method + path.partition("?")[0]
     signature = sign_message(private_key, msg)
-    return {
-        "KALSHI-ACCESS-KEY": settings.API_KEY_ID,
+    headers = {
+        "KALSHI-ACCESS-KEY": _API_KEY_ID,
         "KALSHI-ACCESS-SIGNATURE": signature,
         "KALSHI-ACCESS-TIMESTAMP": timestamp,
-    }
\ No newline at end of file
+    }
+    if content_type:
+        headers["Content-Type"] = content_type
+    return headers
+
+# Signed GET headers reused for polling loops (Kalshi accepts a signature for a few seconds)
+SIG_TTL = 2.0
+_sig_cache = {}
+
+
+def kalshi_headers_cached(method, path):
+    """kalshi_headers, reusing a signature made in the last SIG_TTL seconds for the same request line."""
+    key = (method, path.partition("?")[0])
+    now = time.monotonic()
+    cached = _sig_cache.get(key)
+    if cached is not None and now - cached[0] < SIG_TTL:
+        return dict(cached[1])
+    headers = kalshi_headers(method, path)
+    # Order ids make every polled path unique, so drop expired entries as we go
+    for stale in [k for k, (ts, _) in _sig_cache.items() if now - ts >= SIG_TTL]:
+        del _sig_cache[stale]
+    _sig_cache[key] = (now, headers)
+    return dict(headers)
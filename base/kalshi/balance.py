@@ -5,55 +5,133 @@ Kalshi balance and portfolio value utilities.
 import time
 from config import settings
 from app import state
+from core import fastjson
 from core.session import SESSION
+from core.singleflight import SingleFlight
 from kalshi.auth import kalshi_headers
+from kalshi import async_client
 
+BALANCE_PATH = "/trade-api/v2/portfolio/balance"
 
-def get_kalshi_balance(force=False):
-    """Get current Kalshi account balance."""
-    if settings.PLACE_LIVE_KALSHI_ORDERS != "YES":
+# Concurrent cache misses share one in-flight /portfolio/balance request
+_BALANCE_FLIGHT = SingleFlight()
+
+
+def _apply_balance(data, now):
+    """Extract cash balance (dollars) from a /portfolio/balance body and cache it; None if unrecognized."""
+    cash_val = None
+    if "cash" in data:
+        cash_val = float(data["cash"]) / 100.0
+    elif "available_cash" in data:
+        cash_val = float(data["available_cash"]) / 100.0
+    elif "balances" in data and "available_cash" in data["balances"]:
+        cash_val = float(data["balances"]["available_cash"]) / 100.0
+    elif "balance" in data:
+        cash_val = float(data["balance"]) / 100.0
+
+    if cash_val is not None:
         if settings.VERBOSE:
-            print(f"💵 SIM MODE BALANCE: ${settings.CAPITAL_SIM:.2f}")
-        return settings.CAPITAL_SIM
+            print(f"💰 LIVE KALSHI BALANCE: ${cash_val:,.2f}")
+        state._last_balance_ts = now
+        state._last_balance_val = cash_val
+        return cash_val
+
+    if settings.VERBOSE:
+        print("⚠️ Unexpected Kalshi balance format:", data)
+    return None
+
+
+def _apply_portfolio_value(data, now):
+    """Extract portfolio value (dollars) from a /portfolio/balance body and cache it; None if unrecognized."""
+    portfolio_val = None
+    if "portfolio_value" in data:
+        portfolio_val = float(data["portfolio_value"]) / 100.0
+    elif "equity" in data:
+        portfolio_val = float(data["equity"]) / 100.0
+    elif "total_equity" in data:
+        portfolio_val = float(data["total_equity"]) / 100.0
+
+    if portfolio_val is not None:
+        if settings.VERBOSE:
+            print(f"💼 LIVE KALSHI PORTFOLIO VALUE: ${portfolio_val:,.2f}")
+        state._last_portfolio_value_ts = now
+        state._last_portfolio_value_val = portfolio_val
+        return portfolio_val
 
-    now = time.time()
-    if not force and (now - state._last_balance_ts) < settings.BALANCE_CACHE_SECS:
-        return state._last_balance_val
+    if settings.VERBOSE:
+        print("⚠️ Unexpected Kalshi portfolio value format:", data)
+    return None
 
-    path = "/trade-api/v2/portfolio/balance"
-    headers = kalshi_headers("GET", path)
-    try:
-        res = SESSION.get(settings.KALSHI_BASE_URL + path, headers=headers, timeout=8)
-        data = res.json()
-
-        cash_val = None
-        if "cash" in data:
-            cash_val = float(data["cash"]) / 100.0
-        elif "available_cash" in data:
-            cash_val = float(data["available_cash"]) / 100.0
-        elif "balances" in data and "available_cash" in data["balances"]:
-            cash_val = float(data["balances"]["available_cash"]) / 100.0
-        elif "balance" in data:
-            cash_val = float(data["balance"]) / 100.0
 
-        if cash_val is not None:
-            if settings.VERBOSE:
-                print(f"💰 LIVE KALSHI BALANCE: ${cash_val:,.2f}")
-            state._last_balance_ts = now
-            state._last_balance_val = cash_val
-            return cash_val
+def _fetch_balance_payload(force=False):
+    """Parsed /portfolio/balance body, cached for BALANCE_CACHE_SECS; None if the fetch failed.
 
-        if settings.VERBOSE:
-            print("⚠️ Unexpected Kalshi balance format:", data)
+    Cash balance and portfolio value both come from this one response, so a
+    refresh of either serves the other without a second signed GET.
+    """
+    now = time.time()
+    if not force and (now - state._last_balance_payload_ts) < settings.BALANCE_CACHE_SECS:
+        return state._last_balance_payload
+    return _BALANCE_FLIGHT.do("balance", _fetch_balance_payload_uncached, now)
+
+
+def _fetch_balance_payload_uncached(now):
+    """Single /portfolio/balance round-trip behind _fetch_balance_payload."""
+    headers = kalshi_headers("GET", BALANCE_PATH)
+    data = None
+    try:
+        res = SESSION.get(settings.KALSHI_BASE_URL + BALANCE_PATH, headers=headers, timeout=8)
+        data = fastjson.loads(res.content)
     except Exception as e:
         if settings.VERBOSE:
             print(f"❌ Kalshi balance fetch error: {e}")
+    return _store_balance_payload(data, now)
+
 
+def _store_balance_payload(data, now):
+    """Cache a balance body (None on failure, which also holds off retries for the TTL)."""
+    if not isinstance(data, dict):
+        data = None
+    state._last_balance_payload_ts = now
+    state._last_balance_payload = data
+    return data
+
+
+def _balance_from_payload(data, now):
+    """Cash balance from a payload, falling back to CAPITAL_SIM (and caching that) on failure."""
+    if data is not None:
+        cash_val = _apply_balance(data, now)
+        if cash_val is not None:
+            return cash_val
     state._last_balance_ts = now
     state._last_balance_val = settings.CAPITAL_SIM
     return settings.CAPITAL_SIM
 
 
+def _portfolio_value_from_payload(data, now):
+    """Portfolio value from a payload; None if missing or the fetch failed."""
+    if data is not None:
+        portfolio_val = _apply_portfolio_value(data, now)
+        if portfolio_val is not None:
+            return portfolio_val
+    state._last_portfolio_value_ts = now
+    return None
+
+
+def get_kalshi_balance(force=False):
+    """Get current Kalshi account balance."""
+    if settings.PLACE_LIVE_KALSHI_ORDERS != "YES":
+        if settings.VERBOSE:
+            print(f"💵 SIM MODE BALANCE: ${settings.CAPITAL_SIM:.2f}")
+        return settings.CAPITAL_SIM
+
+    now = time.time()
+    if not force and (now - state._last_balance_ts) < settings.BALANCE_CACHE_SECS:
+        return state._last_balance_val
+
+    return _balance_from_payload(_fetch_balance_payload(force), now)
+
+
 def get_kalshi_portfolio_value(force=False):
     """Get current Kalshi portfolio value (cash + positions)."""
     if settings.PLACE_LIVE_KALSHI_ORDERS != "YES":
@@ -63,32 +141,30 @@ def get_kalshi_portfolio_value(force=False):
     if not force and (now - state._last_portfolio_value_ts) < settings.BALANCE_CACHE_SECS and state._last_portfolio_value_val is not None:
         return state._last_portfolio_value_val
 
-    path = "/trade-api/v2/portfolio/balance"
-    headers = kalshi_headers("GET", path)
-    try:
-        res = SESSION.get(settings.KALSHI_BASE_URL + path, headers=headers, timeout=8)
-        data = res.json()
+    return _portfolio_value_from_payload(_fetch_balance_payload(force), now)
 
-        portfolio_val = None
-        if "portfolio_value" in data:
-            portfolio_val = float(data["portfolio_value"]) / 100.0
-        elif "equity" in data:
-            portfolio_val = float(data["equity"]) / 100.0
-        elif "total_equity" in data:
-            portfolio_val = float(data["total_equity"]) / 100.0
 
-        if portfolio_val is not None:
-            if settings.VERBOSE:
-                print(f"💼 LIVE KALSHI PORTFOLIO VALUE: ${portfolio_val:,.2f}")
-            state._last_portfolio_value_ts = now
-            state._last_portfolio_value_val = portfolio_val
-            return portfolio_val
+async def _fetch_balance_payload_async(force=False):
+    """Async _fetch_balance_payload over the shared aiohttp session (same cache)."""
+    now = time.time()
+    if not force and (now - state._last_balance_payload_ts) < settings.BALANCE_CACHE_SECS:
+        return state._last_balance_payload
 
-        if settings.VERBOSE:
-            print("⚠️ Unexpected Kalshi portfolio value format:", data)
+    data = None
+    try:
+        _, body = await async_client.kalshi_get(BALANCE_PATH)
+        data = fastjson.loads(body)
     except Exception as e:
         if settings.VERBOSE:
-            print(f"❌ Kalshi portfolio value fetch error: {e}")
+            print(f"❌ Kalshi balance fetch error: {e}")
+    return _store_balance_payload(data, now)
 
-    state._last_portfolio_value_ts = now
-    return None
\ No newline at end of file
+
+async def get_kalshi_balance_and_value_async(force=False):
+    """Async (balance, portfolio value) from one /portfolio/balance fetch (same caching/fallback)."""
+    if settings.PLACE_LIVE_KALSHI_ORDERS != "YES":
+        return settings.CAPITAL_SIM, None
+
+    now = time.time()
+    data = await _fetch_balance_payload_async(force)
+    return _balance_from_payload(data, now), _portfolio_value_from_payload(data, now)
@@ -0,0 +1,77 @@
+"""
+Minimal persistent-connection HTTP client for the hottest Kalshi REST calls.
+
+Order polling and cancels go through a single keep-alive http.client
+connection instead of requests.Session, skipping PreparedRequest/cookie/hook
+overhead on every call. Calls are serialized behind a lock, so keep this to
+short, latency-sensitive requests; everything else should use core.session.
+"""
+
+import http.client
+import threading
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+from config import settings
+
+_BASE = urlsplit(settings.KALSHI_BASE_URL)
+_DEFAULT_HEADERS = {"Accept": "application/json", "Connection": "keep-alive"}
+
+_lock = threading.Lock()
+_conn: Optional[http.client.HTTPConnection] = None
+
+
+def _new_connection(timeout: float) -> http.client.HTTPConnection:
+    if _BASE.scheme == "http":
+        return http.client.HTTPConnection(_BASE.hostname, _BASE.port, timeout=timeout)
+    return http.client.HTTPSConnection(_BASE.hostname, _BASE.port, timeout=timeout)
+
+
+def _close():
+    global _conn
+    if _conn is not None:
+        try:
+            _conn.close()
+        except Exception:
+            pass
+        _conn = None
+
+
+def _request(method: str, path: str, headers: Dict[str, str], timeout: float) -> Tuple[int, bytes]:
+    """Send one request on the shared connection, reconnecting once if the server dropped it."""
+    global _conn
+    hdrs = dict(_DEFAULT_HEADERS)
+    hdrs.update(headers)
+    with _lock:
+        for attempt in range(2):
+            if _conn is None:
+                _conn = _new_connection(timeout)
+            try:
+                _conn.timeout = timeout
+                if _conn.sock is not None:
+                    _conn.sock.settimeout(timeout)
+                _conn.request(method, path, headers=hdrs)
+                res = _conn.getresponse()
+                body = res.read()
+                if res.will_close:
+                    _close()
+                return res.status, body
+            except (http.client.RemoteDisconnected, http.client.BadStatusLine,
+                    http.client.CannotSendRequest, ConnectionResetError, BrokenPipeError):
+                # Idle keep-alive connection closed server-side: retry once on a fresh socket
+                _close()
+                if attempt:
+                    raise
+            except Exception:
+                _close()
+                raise
+
+
+def fast_get(path: str, headers: Dict[str, str], timeout: float = 8) -> Tuple[int, bytes]:
+    """GET path on the Kalshi API; returns (status, raw body)."""
+    return _request("GET", path, headers, timeout)
+
+
+def fast_delete(path: str, headers: Dict[str, str], timeout: float = 8) -> Tuple[int, bytes]:
+    """DELETE path on the Kalshi API; returns (status, raw body)."""
+    return _request("DELETE", path, headers, timeout)
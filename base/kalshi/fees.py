@@ -3,15 +3,39 @@ Kalshi fee calculations.
 """
 
 import math
+from typing import Union
 
+import numpy as np
 
-def kalshi_fee(num_contracts: int, price: float, is_maker: bool = False) -> float:
-    """Calculate Kalshi fee for a trade."""
-    fee_rate = 0.0175 if is_maker else 0.07
+MAKER_FEE_RATE = 0.0175
+TAKER_FEE_RATE = 0.07
+
+
+def kalshi_fee(
+    num_contracts: Union[int, np.ndarray],
+    price: Union[float, np.ndarray],
+    is_maker: bool = False,
+) -> Union[float, np.ndarray]:
+    """Calculate Kalshi fee for a trade.
+
+    Scalar inputs return a float; if either input is an ndarray this delegates
+    to kalshi_fees_vec and returns an ndarray of per-element fees.
+    """
+    if isinstance(num_contracts, np.ndarray) or isinstance(price, np.ndarray):
+        return kalshi_fees_vec(num_contracts, price, is_maker=is_maker)
+    fee_rate = MAKER_FEE_RATE if is_maker else TAKER_FEE_RATE
     raw = fee_rate * num_contracts * price * (1 - price)
     return math.ceil(raw * 100) / 100.0
 
 
+def kalshi_fees_vec(counts, prices, is_maker=False) -> np.ndarray:
+    """Vectorized kalshi_fee over arrays of counts/prices (is_maker may be a bool or bool array)."""
+    counts = np.asarray(counts, dtype=np.float64)
+    prices = np.asarray(prices, dtype=np.float64)
+    rate = np.where(is_maker, MAKER_FEE_RATE, TAKER_FEE_RATE)
+    return np.ceil(rate * counts * prices * (1.0 - prices) * 100.0) / 100.0
+
+
 def kalshi_fee_per_contract(price: float, is_maker: bool = False) -> float:
     """Calculate Kalshi fee per contract."""
     return kalshi_fee(1, price, is_maker=is_maker)
\ No newline at end of file
@@ -2,9 +2,11 @@
 Kalshi market data utilities.
 """
 
+import operator
 import requests
 from typing import Optional, List, Dict, Any
 from config import settings
+from core import fastjson
 from core.session import SESSION
 from kalshi.auth import kalshi_headers
 
@@ -30,7 +32,7 @@ def get_kalshi_markets(event_ticker: str, force_live: bool = False) -> Optional[
     try:
         res = SESSION.get(url, headers=headers, timeout=1.5)
         if res.status_code == 200:
-            markets = res.json().get("markets", [])
+            markets = fastjson.loads(res.content).get("markets", [])
             markets = [
                 m for m in markets
                 if m.get("status") == "active" and (m.get("yes_bid") or m.get("yes_ask"))
@@ -50,17 +52,17 @@ def get_kalshi_markets(event_ticker: str, force_live: bool = False) -> Optional[
         return []
 
 
+_get_volume = operator.methodcaller("get", "volume")
+
+
 def get_event_total_volume(event_ticker: str, markets: Optional[List[Dict[str, Any]]] = None) -> Optional[int]:
     """Calculate total trading volume for an event."""
     if markets is None:
         markets = get_kalshi_markets(event_ticker, force_live=True)
     if not markets:
         return None
-    total_volume = sum(
-        market.get("volume", 0)
-        for market in markets
-        if market.get("volume") is not None
-    )
+    # One dict lookup per market; None/0 volumes add nothing
+    total_volume = sum(v for v in map(_get_volume, markets) if v)
     return total_volume if total_volume > 0 else None
 
 
@@ -2,15 +2,46 @@
 Kalshi order management utilities.
 """
 
+import itertools
 import json
+import os
+import random
 import time
-import uuid
 import requests
 from typing import Optional, Tuple, Dict, Any
 from config import settings
+from core import fastjson
 from core.session import SESSION
-from kalshi.auth import kalshi_headers
-from kalshi.positions import get_live_positions
+from kalshi.auth import kalshi_headers, kalshi_headers_cached
+from kalshi.fast_http import fast_get, fast_delete
+from kalshi.positions import get_live_positions, invalidate_live_positions
+
+__all__ = [
+    "prepare_kalshi_order",
+    "safe_prepare_kalshi_order",
+    "get_order",
+    "get_order_fill_status",
+    "wait_for_fill_or_cancel",
+]
+
+# While the WebSocket fill channel is live, fills wake wait_for_fill_or_cancel
+# immediately; REST is only re-checked this often to catch cancels/rejects.
+ORDER_WS_RECHECK_SECS = 5.0
+
+# REST-only fill polling starts fast (most taker fills land within ~200ms) and
+# backs off geometrically with jitter up to a 1s cap.
+ORDER_POLL_INITIAL_SECS = 0.05
+ORDER_POLL_MAX_SECS = 1.0
+ORDER_POLL_BACKOFF = 1.8
+
+# Order status classes (Kalshi reports fully matched orders as "executed")
+_FILLED_STATUSES = frozenset({"filled", "closed", "executed"})
+_CANCELLED = frozenset({"cancelled", "canceled", "closed_cancelled", "rejected"})
+
+# client_order_id only has to be unique per account; pid + process start nanos
+# plus a counter is collision-free without a urandom read per order.
+_PROC_TAG = f"{os.getpid():x}{time.time_ns():x}"
+_ORDER_SEQ = itertools.count()
 
 
 def prepare_kalshi_order(
@@ -22,30 +53,26 @@ def prepare_kalshi_order(
     action: str = "buy",
 ) -> Dict[str, Any]:
     """Prepare a Kalshi order payload."""
-    path = "/trade-api/v2/portfolio/orders"
-    headers = kalshi_headers("POST", path)
-    headers.update({"Content-Type": "application/json"})
+    verbose = settings.VERBOSE
+    live = settings.PLACE_LIVE_KALSHI_ORDERS == "YES"
+    side_l = side.lower()
 
-    if side.lower() != "yes":
+    if side_l != "yes":
         raise ValueError(f"❌ Attempted to place a {side.upper()} order — only YES trades allowed.")
 
+    # Only YES orders get past the guard above, so the price is always yes_price
+    yes_price_cents = int(round(float(price) * 100))
     payload = {
         "ticker": market_ticker,
         "action": action.lower(),
-        "side": side.lower(),
+        "side": side_l,
         "count": int(quantity),
         "type": order_type,
-        "client_order_id": str(uuid.uuid4()),
+        "client_order_id": f"{_PROC_TAG}-{next(_ORDER_SEQ):x}",
+        "yes_price": yes_price_cents,
     }
 
-    if side.lower() == "yes":
-        payload["yes_price"] = int(round(float(price) * 100))
-    elif side.lower() == "no":
-        payload["no_price"] = int(round(float(price) * 100))
-    else:
-        raise ValueError(f"Invalid side: {side}")
-
-    if settings.VERBOSE:
+    if verbose:
         print("\n📦 === Kalshi Order Build ===")
         print(f"Ticker: {market_ticker}")
         print(f"Action: {action}")
@@ -56,12 +83,19 @@ def prepare_kalshi_order(
         print(json.dumps(payload, indent=2))
         print("────────────────────────────────────────────")
 
-    if settings.PLACE_LIVE_KALSHI_ORDERS == "YES":
-        if settings.VERBOSE:
+    if live:
+        if verbose:
             print("🚀 Sending live order to Kalshi...")
-        response = SESSION.post(settings.KALSHI_BASE_URL + path, headers=headers, json=payload, timeout=10)
-        if settings.VERBOSE:
+        path = "/trade-api/v2/portfolio/orders"
+        body = fastjson.dumpb(payload)
+        # Signed right before sending so the timestamp is as fresh as possible
+        headers = kalshi_headers("POST", path, content_type="application/json")
+        response = SESSION.post(settings.KALSHI_BASE_URL + path, headers=headers, data=body, timeout=10)
+        if verbose:
             print("💬 Kalshi Response:", response.status_code, response.text)
+        if response.status_code in (200, 201):
+            # Next safe-order check must see this order's exposure
+            invalidate_live_positions()
         return {"response": response, "payload": payload}
     print("🧪 SAFE MODE: Order preview only, not submitted.")
     return {"response": None, "payload": payload}
@@ -119,7 +153,7 @@ def _extract_order_id(response) -> Optional[str]:
     if response is None:
         return None
     try:
-        data = response.json()
+        data = fastjson.loads(response.content)
         return data.get("order", {}).get("order_id") or data.get("order_id")
     except Exception:
         return None
@@ -132,34 +166,40 @@ def get_order(order_id: str) -> Tuple[Optional[Dict[str, Any]], Optional[int]]:
         Tuple of (order_data, status_code)
     """
     path = f"/trade-api/v2/portfolio/orders/{order_id}"
-    headers = kalshi_headers("GET", path)
+    # Polled every second by the fill waits; reuse the signature instead of re-signing each tick
+    headers = kalshi_headers_cached("GET", path)
     try:
-        res = SESSION.get(settings.KALSHI_BASE_URL + path, headers=headers, timeout=10)
+        status_code, body = fast_get(path, headers, timeout=10)
         try:
-            data = res.json()
+            data = fastjson.loads(body)
         except Exception:
-            data = {"order": {"status": f"http_{res.status_code}", "remaining_count": None, "filled_count": 0}}
-        return data, res.status_code
+            data = {"order": {"status": f"http_{status_code}", "remaining_count": None, "filled_count": 0}}
+        return data, status_code
     except Exception as e:
         if settings.VERBOSE:
             print(f"⚠️ Error getting order {order_id}: {e}")
         return None, None
 
 
-def get_order_fill_status(order_id: str) -> Tuple[bool, int, int]:
+def get_order_fill_status(order_id: str) -> Tuple[bool, int, int, str]:
     """Get fill status of an order.
     
     Returns:
-        Tuple of (is_filled, filled_count, remaining_count)
+        Tuple of (is_filled, filled_count, remaining_count, status) - status is the
+        lowercased order status ("" if the order could not be fetched)
     """
     if not order_id:
-        return False, 0, 0
+        return False, 0, 0, ""
     
     data, status_code = get_order(order_id)
     if not data or status_code != 200:
-        return False, 0, 0
+        return False, 0, 0, ""
     
-    order = data.get("order") or data
+    return _order_fill_state(data.get("order") or data)
+
+
+def _order_fill_state(order: Dict[str, Any]) -> Tuple[bool, int, int, str]:
+    """Return (is_filled, filled_count, remaining_count, status) for a Kalshi order dict."""
     status = str(order.get("status") or "").lower()
     
     # Extract filled count
@@ -181,18 +221,25 @@ def get_order_fill_status(order_id: str) -> Tuple[bool, int, int]:
             pass
     
     # Check if fully filled
-    cancelled_like = {"cancelled", "canceled", "closed_cancelled", "rejected"}
-    is_filled = (
-        status in ("filled", "closed") and 
-        remaining_count == 0 and
-        filled_count > 0
-    ) or (
-        ("executed" in status or "filled" in status) and 
-        remaining_count == 0 and
-        filled_count > 0
-    )
+    is_filled = status in _FILLED_STATUSES and remaining_count == 0 and filled_count > 0
     
-    return is_filled, filled_count, remaining_count
+    return is_filled, filled_count, remaining_count, status
+
+
+def _cancel_remaining(order_id: str, remaining_count: int) -> bool:
+    """Cancel the unfilled remainder of an order; True on HTTP 200."""
+    try:
+        cancel_path = f"/trade-api/v2/portfolio/orders/{order_id}"
+        cancel_headers = kalshi_headers("DELETE", cancel_path)
+        cancel_status, _ = fast_delete(cancel_path, cancel_headers, timeout=5)
+        if cancel_status == 200:
+            if settings.VERBOSE:
+                print(f"✅ Cancelled remaining {remaining_count} contracts for order {order_id}")
+            return True
+    except Exception as e:
+        if settings.VERBOSE:
+            print(f"⚠️ Error cancelling order: {e}")
+    return False
 
 
 def wait_for_fill_or_cancel(
@@ -214,59 +261,77 @@ def wait_for_fill_or_cancel(
     if settings.PLACE_LIVE_KALSHI_ORDERS != "YES":
         return "filled", 0  # Sim mode: assume filled
 
+    # Register for pushed fills before the first REST check so none are missed
+    fill_event = None
+    ws_client = None
+    try:
+        from kalshi.websocket_client import get_websocket_client
+        ws_client = get_websocket_client()
+        if ws_client.connected:
+            fill_event = ws_client.register_order_waiter(order_id)
+        else:
+            ws_client = None
+    except Exception:
+        ws_client = None
+
+    try:
+        return _wait_for_fill_or_cancel(order_id, timeout_secs, require_full, fill_event, ws_client)
+    finally:
+        if ws_client is not None:
+            ws_client.unregister_order_waiter(order_id)
+
+
+def _wait_for_fill_or_cancel(order_id, timeout_secs, require_full, fill_event, ws_client) -> Tuple[str, int]:
+    """Poll loop behind wait_for_fill_or_cancel; waits on fill_event instead of sleeping when set."""
+    verbose = settings.VERBOSE
     start_time = time.time()
+    interval = ORDER_POLL_INITIAL_SECS
     
     while time.time() - start_time < timeout_secs:
-        is_filled, filled_count, remaining_count = get_order_fill_status(order_id)
+        is_filled, filled_count, remaining_count, status = get_order_fill_status(order_id)
         
         if is_filled:
-            if settings.VERBOSE:
+            if verbose:
                 print(f"✅ Order fully filled: {order_id} (qty={filled_count})")
             return "filled", filled_count
         
         # Check for partial fill if not requiring full fill
         if not require_full and filled_count > 0:
-            if settings.VERBOSE:
+            if verbose:
                 print(f"📊 Partial fill detected: {order_id} (filled={filled_count}, remaining={remaining_count})")
             return "partial", filled_count
         
-        # Check if cancelled
-        data, status_code = get_order(order_id)
-        if data:
-            order = data.get("order") or data
-            status = str(order.get("status") or "").lower()
-            if status in ["cancelled", "canceled", "rejected"]:
-                return "cancelled", filled_count
+        # Check if cancelled (same response as the fill check above)
+        if status in _CANCELLED:
+            return "cancelled", filled_count
         
-        if settings.VERBOSE:
+        if verbose:
             print(f"⌛ Waiting fill... order={order_id}, filled={filled_count}, remaining={remaining_count}, elapsed={time.time()-start_time:.1f}s")
         
-        time.sleep(1.0)
+        if fill_event is not None and ws_client.connected:
+            # Woken early by a pushed fill; otherwise re-check REST for cancels
+            time_left = timeout_secs - (time.time() - start_time)
+            fill_event.wait(max(0.0, min(ORDER_WS_RECHECK_SECS, time_left)))
+            fill_event.clear()
+        else:
+            if not status:
+                # Lookup failed (5xx/network): poll at the cap rather than hammering
+                interval = ORDER_POLL_MAX_SECS
+            time_left = timeout_secs - (time.time() - start_time)
+            time.sleep(max(0.0, min(interval, time_left)))
+            interval = min(ORDER_POLL_MAX_SECS, interval * ORDER_POLL_BACKOFF) * random.uniform(0.9, 1.1)
 
     # Timeout: try to cancel remaining
-    if settings.VERBOSE:
+    if verbose:
         print(f"⏳ Order timeout after {timeout_secs}s: {order_id}, attempting to cancel remaining...")
     
     # Get final status before cancelling
-    is_filled, filled_count, remaining_count = get_order_fill_status(order_id)
+    is_filled, filled_count, remaining_count, _ = get_order_fill_status(order_id)
     
     if filled_count > 0 and remaining_count > 0:
         # Partial fill occurred, cancel remaining
-        try:
-            cancel_path = f"/trade-api/v2/portfolio/orders/{order_id}"
-            cancel_headers = kalshi_headers("DELETE", cancel_path)
-            cancel_res = SESSION.delete(
-                f"{settings.KALSHI_BASE_URL}{cancel_path}",
-                headers=cancel_headers,
-                timeout=5
-            )
-            if cancel_res.status_code == 200:
-                if settings.VERBOSE:
-                    print(f"✅ Cancelled remaining {remaining_count} contracts for order {order_id}")
-                return "partial", filled_count
-        except Exception as e:
-            if settings.VERBOSE:
-                print(f"⚠️ Error cancelling order: {e}")
+        if _cancel_remaining(order_id, remaining_count):
+            return "partial", filled_count
     
     if filled_count > 0:
         return "partial", filled_count
@@ -2,168 +2,317 @@
 Kalshi position management utilities.
 """
 
+import time
 from typing import Optional, List, Dict, Any
 from config import settings
+from app import state
+from core import fastjson
 from core.session import SESSION
+from core.singleflight import SingleFlight
 from kalshi.auth import kalshi_headers
+from kalshi import async_client
 
+try:
+    import ijson
+except ImportError:
+    ijson = None
 
-def get_live_positions() -> List[Dict[str, Any]]:
-    """Fetch current live positions from Kalshi."""
-    path = "/trade-api/v2/portfolio/positions"
+
+POSITIONS_PATH = "/trade-api/v2/portfolio/positions"
+
+# Bursts of order checks share one in-flight /portfolio/positions request
+_POSITIONS_FLIGHT = SingleFlight()
+
+
+def _compute_avg_price(mp: Dict[str, Any], abs_pos: int) -> Optional[float]:
+    """Average entry price (0-1) for a market_positions record, or None if it can't be derived.
+
+    Prefers market_exposure_dollars / position and falls back to
+    total_traded_dollars / total_traded.
+    """
+    avg_price = None
+    try:
+        market_exposure_dollars = float(mp.get("market_exposure_dollars", "0"))
+        if abs_pos > 0 and market_exposure_dollars > 0:
+            avg_price = market_exposure_dollars / abs_pos
+    except (ValueError, TypeError):
+        pass
+
+    if avg_price is None or avg_price <= 0:
+        total_traded = mp.get("total_traded", 0)
+        try:
+            total_traded_dollars = float(mp.get("total_traded_dollars", "0"))
+            if total_traded > 0:
+                avg_price = total_traded_dollars / total_traded
+        except (ValueError, TypeError):
+            pass
+
+    if avg_price is None or avg_price <= 0:
+        return None
+    if avg_price > 1.0:
+        avg_price = avg_price / 100.0
+    return avg_price
+
+
+def _make_pos(ticker, side, contracts, avg_price, event_ticker=None) -> Optional[Dict[str, Any]]:
+    """Normalize one position into the live position dict shape; None if empty/invalid."""
+    try:
+        if not ticker:
+            return None
+        side = (side or "").lower()
+        qty = abs(int(contracts or 0))
+        if qty <= 0:
+            return None
+        ap = float(avg_price or 0.0)
+        if ap > 1.0:
+            ap = ap / 100.0
+        return {
+            "ticker": ticker,
+            "side": side,
+            "contracts": qty,
+            "avg_price": ap,
+            "event_ticker": event_ticker or "",
+        }
+    except Exception as e:
+        print(f"⚠️ parse helper err: {e}")
+        return None
+
+
+def _market_position(mp: Dict[str, Any], evt: str, warn: bool = False) -> Optional[Dict[str, Any]]:
+    """Position dict for a market_positions record (top-level or nested under an event)."""
+    ticker = mp.get("ticker")
+    if not ticker:
+        return None
+    position = mp.get("position", 0)
+    if position == 0:
+        return None
+
+    avg_price = _compute_avg_price(mp, abs(position))
+    if avg_price is None:
+        if warn and settings.VERBOSE:
+            print(f"⚠️ Could not calculate avg_price for {ticker}, skipping")
+        return None
+
+    side = "yes" if position > 0 else "no"
+    return _make_pos(ticker, side, abs(position), avg_price, evt)
+
+
+def _event_positions(ep: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Position dicts for the markets nested in an event_positions record."""
+    evt = ep.get("event_ticker") or ep.get("event") or ""
+    nested_markets = ep.get("market_positions") or ep.get("markets") or []
+    out = []
+    _append = out.append
+    for mp in nested_markets:
+        pos = _market_position(mp, evt)
+        if pos is not None:
+            _append(pos)
+    return out
+
+
+def _legacy_position(p: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Position dict for a record from the older positions/orders response shapes."""
+    try:
+        ticker = p.get("ticker") or p.get("market_ticker") or p.get("id")
+        side = (p.get("side") or "").lower()
+        contracts = int(
+            p.get("contracts_count") or p.get("count") or
+            p.get("size") or p.get("contracts") or 0
+        )
+        ap_raw = (p.get("average_price") or p.get("avg_price") or p.get("entry_price") or 0)
+        avg_price = float(ap_raw) / (100.0 if float(ap_raw or 0) > 1 else 1)
+        if contracts > 0 and ticker:
+            return _make_pos(ticker, side, contracts, avg_price, p.get("event_ticker", ""))
+    except Exception as e:
+        print(f"⚠️ Error parsing legacy position: {e} → {p}")
+    return None
+
+
+def _parse_live_positions(data: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Flatten a /portfolio/positions body into live position dicts."""
+    live_positions = []
+    _append = live_positions.append
+
+    for mp in (data.get("market_positions") or []):
+        pos = _market_position(mp, mp.get("event_ticker", ""), warn=True)
+        if pos is not None:
+            _append(pos)
+
+    for ep in (data.get("event_positions") or []):
+        live_positions.extend(_event_positions(ep))
+
+    raw_positions = (
+        data.get("positions")
+        or data.get("portfolio", {}).get("positions")
+        or data.get("orders")
+        or []
+    )
+    for p in raw_positions:
+        pos = _legacy_position(p)
+        if pos is not None:
+            _append(pos)
+
+    if settings.VERBOSE and live_positions:
+        print(f"✅ Parsed {len(live_positions)} positions from Kalshi API")
+
+    return live_positions
+
+
+# Array-item prefixes in a /portfolio/positions body, in _parse_live_positions precedence order
+_LEGACY_PREFIXES = ("positions.item", "portfolio.positions.item", "orders.item")
+_STREAM_PREFIXES = frozenset(("market_positions.item", "event_positions.item") + _LEGACY_PREFIXES)
+
+
+def _stream_live_positions(fp) -> List[Dict[str, Any]]:
+    """Incremental _parse_live_positions over a file-like body using ijson.
+
+    Each array item is built, converted and dropped before the next one is read,
+    so peak memory is one record rather than the whole decoded payload.
+    """
+    market, events = [], []
+    _append_market = market.append
+    legacy: Dict[str, List[Dict[str, Any]]] = {}
+    parser = ijson.parse(fp, use_float=True)
+    for prefix, event, value in parser:
+        if prefix not in _STREAM_PREFIXES or event != "start_map":
+            continue
+        builder = ijson.ObjectBuilder()
+        depth = 1
+        builder.event(event, value)
+        for _, event, value in parser:
+            if event in ("start_map", "start_array"):
+                depth += 1
+            elif event in ("end_map", "end_array"):
+                depth -= 1
+            builder.event(event, value)
+            if depth == 0:
+                break
+        record = builder.value
+        if prefix == "market_positions.item":
+            pos = _market_position(record, record.get("event_ticker", ""), warn=True)
+            if pos is not None:
+                _append_market(pos)
+        elif prefix == "event_positions.item":
+            events.extend(_event_positions(record))
+        else:
+            legacy.setdefault(prefix, []).append(record)
+
+    live_positions = market + events
+    # Same "first non-empty legacy list wins" rule as the in-memory parser
+    for prefix in _LEGACY_PREFIXES:
+        if legacy.get(prefix):
+            for p in legacy[prefix]:
+                pos = _legacy_position(p)
+                if pos is not None:
+                    live_positions.append(pos)
+            break
+
+    if settings.VERBOSE and live_positions:
+        print(f"✅ Parsed {len(live_positions)} positions from Kalshi API")
+
+    return live_positions
+
+
+def get_live_positions(force: bool = False) -> List[Dict[str, Any]]:
+    """Fetch current live positions from Kalshi.
+
+    Results are reused for POSITIONS_CACHE_SECS so back-to-back order checks share
+    one snapshot; pass force=True where a stale view could cause a wrong decision.
+    """
+    now = time.time()
+    if not force and state._last_positions_val is not None and (now - state._last_positions_ts) < settings.POSITIONS_CACHE_SECS:
+        return list(state._last_positions_val)
+
+    positions = _POSITIONS_FLIGHT.do("positions", _fetch_live_positions)
+    if positions is None:
+        return []
+    state._last_positions_ts = now
+    state._last_positions_val = positions
+    # Shallow copy so callers sharing one in-flight fetch don't share the list itself
+    return list(positions)
+
+
+def invalidate_live_positions():
+    """Drop the cached positions snapshot (call after placing an order)."""
+    state._last_positions_ts = 0.0
+    state._last_positions_val = None
+
+
+def _fetch_live_positions() -> Optional[List[Dict[str, Any]]]:
+    """Single /portfolio/positions round-trip behind get_live_positions; None on failure."""
+    path = POSITIONS_PATH
     headers = kalshi_headers("GET", path)
     try:
+        if ijson is not None:
+            return _fetch_live_positions_streaming(path, headers)
+
         res = SESSION.get(settings.KALSHI_BASE_URL + path, headers=headers, timeout=8)
         txt = res.text[:300]
         if res.status_code != 200:
             print(f"⚠️ Positions fetch failed: {res.status_code} {txt}")
             if settings.VERBOSE:
                 print(f"   Full response: {res.text[:500]}")
-            return []
+            return None
 
         try:
-            data = res.json()
+            data = fastjson.loads(res.content)
         except Exception:
             print(f"⚠️ Non-JSON /positions body: {txt}")
+            return None
+
+        return _parse_live_positions(data)
+
+    except Exception as e:
+        print(f"❌ Error fetching live positions: {e}")
+        if settings.VERBOSE:
+            import traceback
+            traceback.print_exc()
+        return None
+
+
+def _fetch_live_positions_streaming(path: str, headers: Dict[str, str]) -> Optional[List[Dict[str, Any]]]:
+    """_fetch_live_positions body parsed incrementally from the socket (ijson installed)."""
+    with SESSION.get(settings.KALSHI_BASE_URL + path, headers=headers, timeout=8, stream=True) as res:
+        if res.status_code != 200:
+            txt = res.text[:300]
+            print(f"⚠️ Positions fetch failed: {res.status_code} {txt}")
+            if settings.VERBOSE:
+                print(f"   Full response: {res.text[:500]}")
+            return None
+
+        # Let urllib3 undo gzip/deflate before ijson sees the bytes
+        res.raw.decode_content = True
+        try:
+            return _stream_live_positions(res.raw)
+        except ijson.JSONError as e:
+            print(f"⚠️ Non-JSON /positions body: {e}")
+            return None
+
+
+async def get_live_positions_async() -> List[Dict[str, Any]]:
+    """Async get_live_positions(force=True) over the shared aiohttp session."""
+    now = time.time()
+    try:
+        status, body = await async_client.kalshi_get(POSITIONS_PATH)
+        if status != 200:
+            txt = body[:300].decode(errors="replace")
+            print(f"⚠️ Positions fetch failed: {status} {txt}")
             return []
 
-        live_positions = []
-
-        def _push_pos(ticker, side, contracts, avg_price, event_ticker=None):
-            try:
-                if not ticker:
-                    return
-                side = (side or "").lower()
-                qty = abs(int(contracts or 0))
-                if qty <= 0:
-                    return
-                ap = float(avg_price or 0.0)
-                if ap > 1.0:
-                    ap = ap / 100.0
-                live_positions.append({
-                    "ticker": ticker,
-                    "side": side,
-                    "contracts": qty,
-                    "avg_price": ap,
-                    "event_ticker": event_ticker or "",
-                })
-            except Exception as e:
-                print(f"⚠️ parse helper err: {e}")
-
-        for mp in (data.get("market_positions") or []):
-            ticker = mp.get("ticker")
-            if not ticker:
-                continue
-            position = mp.get("position", 0)
-            if position == 0:
-                continue
-
-            side = "yes" if position > 0 else "no"
-            contracts = abs(position)
-
-            avg_price = None
-            market_exposure_dollars_str = mp.get("market_exposure_dollars", "0")
-            try:
-                market_exposure_dollars = float(market_exposure_dollars_str)
-                if abs(position) > 0 and market_exposure_dollars > 0:
-                    avg_price = market_exposure_dollars / abs(position)
-                    if avg_price > 1.0:
-                        avg_price = avg_price / 100.0
-            except (ValueError, TypeError):
-                pass
-
-            if avg_price is None or avg_price <= 0:
-                total_traded = mp.get("total_traded", 0)
-                total_traded_dollars_str = mp.get("total_traded_dollars", "0")
-                try:
-                    total_traded_dollars = float(total_traded_dollars_str)
-                    if total_traded > 0:
-                        avg_price = total_traded_dollars / total_traded
-                        if avg_price > 1.0:
-                            avg_price = avg_price / 100.0
-                except (ValueError, TypeError):
-                    pass
-
-            if avg_price is None or avg_price <= 0:
-                if settings.VERBOSE:
-                    print(f"⚠️ Could not calculate avg_price for {ticker}, skipping")
-                continue
-
-            evt = mp.get("event_ticker", "")
-            _push_pos(ticker, side, contracts, avg_price, evt)
-
-        for ep in (data.get("event_positions") or []):
-            evt = ep.get("event_ticker") or ep.get("event") or ""
-            nested_markets = ep.get("market_positions") or ep.get("markets") or []
-            for mp in nested_markets:
-                ticker = mp.get("ticker")
-                if not ticker:
-                    continue
-                position = mp.get("position", 0)
-                if position == 0:
-                    continue
-
-                side = "yes" if position > 0 else "no"
-                contracts = abs(position)
-
-                avg_price = None
-                market_exposure_dollars_str = mp.get("market_exposure_dollars", "0")
-                try:
-                    market_exposure_dollars = float(market_exposure_dollars_str)
-                    if abs(position) > 0 and market_exposure_dollars > 0:
-                        avg_price = market_exposure_dollars / abs(position)
-                        if avg_price > 1.0:
-                            avg_price = avg_price / 100.0
-                except (ValueError, TypeError):
-                    pass
-
-                if avg_price is None or avg_price <= 0:
-                    total_traded = mp.get("total_traded", 0)
-                    total_traded_dollars_str = mp.get("total_traded_dollars", "0")
-                    try:
-                        total_traded_dollars = float(total_traded_dollars_str)
-                        if total_traded > 0:
-                            avg_price = total_traded_dollars / total_traded
-                            if avg_price > 1.0:
-                                avg_price = avg_price / 100.0
-                    except (ValueError, TypeError):
-                        pass
-
-                if avg_price is None or avg_price <= 0:
-                    continue
-
-                _push_pos(ticker, side, contracts, avg_price, evt)
-
-        raw_positions = (
-            data.get("positions")
-            or data.get("portfolio", {}).get("positions")
-            or data.get("orders")
-            or []
-        )
-        for p in raw_positions:
-            try:
-                ticker = p.get("ticker") or p.get("market_ticker") or p.get("id")
-                side = (p.get("side") or "").lower()
-                contracts = int(
-                    p.get("contracts_count") or p.get("count") or
-                    p.get("size") or p.get("contracts") or 0
-                )
-                ap_raw = (p.get("average_price") or p.get("avg_price") or p.get("entry_price") or 0)
-                avg_price = float(ap_raw) / (100.0 if float(ap_raw or 0) > 1 else 1)
-                if contracts > 0 and ticker:
-                    _push_pos(ticker, side, contracts, avg_price, p.get("event_ticker", ""))
-            except Exception as e:
-                print(f"⚠️ Error parsing legacy position: {e} → {p}")
-                continue
-
-        if settings.VERBOSE and live_positions:
-            print(f"✅ Parsed {len(live_positions)} positions from Kalshi API")
-
-        return live_positions
+        try:
+            data = fastjson.loads(body)
+        except Exception:
+            print(f"⚠️ Non-JSON /positions body: {body[:300].decode(errors='replace')}")
+            return []
+
+        positions = _parse_live_positions(data)
+        state._last_positions_ts = now
+        state._last_positions_val = positions
+        return list(positions)
 
     except Exception as e:
         print(f"❌ Error fetching live positions: {e}")
         if settings.VERBOSE:
             import traceback
             traceback.print_exc()
-        return []
\ No newline at end of file
+        return []
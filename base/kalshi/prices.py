@@ -0,0 +1,57 @@
+"""
+Current price lookups for open positions (WebSocket cache first, REST fallback).
+"""
+
+from typing import Optional
+
+from kalshi.markets import get_kalshi_markets, format_price
+
+
+def get_ws_client():
+    """The shared WebSocket client, or None if it can't be loaded."""
+    try:
+        from kalshi.websocket_client import get_websocket_client
+        return get_websocket_client()
+    except Exception:
+        return None
+
+
+def event_market_index(event_ticker: str) -> dict:
+    """Live markets for an event as ticker -> market (one REST fetch)."""
+    mkts = get_kalshi_markets(event_ticker, force_live=True) or []
+    return {m.get("ticker"): m for m in mkts if m.get("ticker")}
+
+
+def yes_exit_price(position: dict, ws_client=None, event_markets: Optional[dict] = None) -> Optional[float]:
+    """Price a YES position would exit at (bid, else ask); WebSocket cache first, REST on miss/stale.
+
+    event_markets memoizes each event's ticker -> market index across one pass.
+    """
+    market_ticker = position.get("market_ticker")
+    if ws_client is not None:
+        price_data = ws_client.get_price(market_ticker)
+        if price_data:
+            yes_bid = price_data.get("yes_bid")
+            exit_price = yes_bid if yes_bid is not None else price_data.get("yes_ask")
+            if exit_price is not None:
+                return exit_price
+
+    event_ticker = position.get("event_ticker", "")
+    if event_markets is not None and event_ticker in event_markets:
+        by_ticker = event_markets[event_ticker]
+    else:
+        by_ticker = event_market_index(event_ticker)
+        if event_markets is not None:
+            event_markets[event_ticker] = by_ticker
+
+    m = by_ticker.get(market_ticker)
+    if not m:
+        return None
+
+    # Integer cents in range skip format_price(); it still clamps anything else
+    raw = m.get("yes_bid")
+    yes_bid = raw / 100.0 if type(raw) is int and 0 <= raw <= 100 else format_price(raw)
+    if yes_bid is not None:
+        return yes_bid
+    raw = m.get("yes_ask")
+    return raw / 100.0 if type(raw) is int and 0 <= raw <= 100 else format_price(raw)
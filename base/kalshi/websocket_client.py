@@ -5,25 +5,89 @@ Provides real-time ticker updates to avoid REST API rate limits.
 
 import asyncio
 import json
+import logging
+import logging.handlers
+import queue
+import random
+import sys
 import time
 import threading
-from typing import Dict, Any, Optional, Set, List
-import websockets
-from websockets.client import WebSocketClientProtocol
+import traceback
+from collections import deque
+from typing import Callable, Dict, Any, Deque, Optional, Set, List, Tuple
+from websockets.asyncio.client import ClientConnection, connect
+from websockets.exceptions import ConnectionClosed
+from websockets.protocol import State
 
 from config import settings
-from kalshi.auth import load_private_key, sign_message
+from core import fastjson
+from kalshi.auth import kalshi_headers
 from kalshi.markets import format_price
-from app import state
+from execution.positions import open_positions
+
+WS_PATH = "/trade-api/ws/v2"
+
+# Bursts of sync_subscriptions_sync() calls (e.g. several fills in one loop
+# pass) are coalesced into one diff-and-subscribe after this quiet period
+SUBSCRIPTION_DEBOUNCE_SECS = 0.05
+
+# Constant parts of subscribe frames, shared across calls ("channels" is plural, a
+# list on the wire; tuples serialize the same and can't be mutated by accident)
+_TICKER_CHANNELS = ("ticker",)
+_FILL_SUB_PARAMS = {"channels": ("fill",)}
+
+# Ticks kept per market in price_history
+PRICE_HISTORY_LEN = 16
+
+# Initial REST price load on connect: bounded concurrency, rate-limited request starts
+INITIAL_PRICE_CONCURRENCY = 4
+INITIAL_PRICE_MIN_INTERVAL = 0.25
+
+# Per-message logging goes through this logger instead of print(): records are only
+# formatted when the level is enabled, and a QueueHandler hands them to a listener
+# thread so the event loop never blocks on stdout. DEBUG when VERBOSE, else INFO.
+logger = logging.getLogger("kalshi.ws")
+logger.setLevel(logging.DEBUG if settings.VERBOSE else logging.INFO)
+logger.propagate = False
+_log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+logger.addHandler(logging.handlers.QueueHandler(_log_queue))
+_log_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def _start_log_listener():
+    """Start the stdout listener draining the WS log queue (idempotent)."""
+    global _log_listener
+    if _log_listener is not None:
+        return
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    _log_listener = logging.handlers.QueueListener(_log_queue, handler)
+    _log_listener.start()
+
+
+def _stop_log_listener():
+    """Flush queued records and stop the listener thread."""
+    global _log_listener
+    if _log_listener is not None:
+        _log_listener.stop()
+        _log_listener = None
+
+
+def _pct(value: Optional[float]) -> str:
+    return f"{value:.2%}" if value else "N/A"
 
 
 class KalshiWebSocketClient:
     """Manages WebSocket connection for real-time Kalshi market data."""
     
     def __init__(self):
-        self.ws: Optional[WebSocketClientProtocol] = None
-        self.price_cache: Dict[str, Dict[str, Any]] = {}  # Thread-safe dict (accessed with locks)
+        self.ws: Optional[ClientConnection] = None
+        # market_ticker -> last PRICE_HISTORY_LEN (last_update monotonic ns, yes_bid, yes_ask)
+        # ticks; the newest is [-1]. Deque appends and [-1] reads are atomic under the GIL,
+        # so single-market reads/writes need no lock; take price_cache_lock only to iterate.
+        self.price_history: Dict[str, Deque[Tuple[int, Optional[float], Optional[float]]]] = {}
         self.price_cache_lock = threading.RLock()
+        self._stale_ns = int(settings.WEBSOCKET_PRICE_CACHE_STALE_SECS * 1e9)
         self.subscribed_markets: Set[str] = set()  # Markets we're subscribed to
         self.subscription_lock = threading.RLock()
         self.message_id = 1
@@ -32,6 +96,16 @@ class KalshiWebSocketClient:
         self.connection_task: Optional[asyncio.Task] = None
         self.reconnect_delay = settings.WEBSOCKET_RECONNECT_DELAY
         self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.connected = False  # True while inside an open connection (fill channel live)
+        # Threads waiting on order fills from the private "fill" channel, keyed by order_id
+        self.order_waiters: Dict[str, threading.Event] = {}
+        self.order_lock = threading.Lock()
+        # Called as listener(market_ticker, yes_bid, yes_ask) on the client loop for every
+        # ticker message; must be cheap and non-blocking (hand real work to another thread)
+        self.price_listeners: List[Callable[[str, Optional[float], Optional[float]], None]] = []
+        # Set from trading threads to request a subscription sync; drained by _subscription_worker
+        self._sub_dirty: Optional[asyncio.Event] = None
+        self._sub_task: Optional[asyncio.Task] = None
     
     def _get_next_message_id(self) -> int:
         """Get next message ID (thread-safe)."""
@@ -42,19 +116,13 @@ class KalshiWebSocketClient:
     
     def _create_auth_headers(self) -> Dict[str, str]:
         """Create authentication headers for WebSocket connection."""
-        timestamp = str(int(time.time() * 1000))
-        method = "GET"
-        path = "/trade-api/ws/v2"
-        msg = timestamp + method + path
-        
-        private_key = load_private_key()
-        signature = sign_message(private_key, msg)
-        
-        return {
-            "KALSHI-ACCESS-KEY": settings.API_KEY_ID,
-            "KALSHI-ACCESS-SIGNATURE": signature,
-            "KALSHI-ACCESS-TIMESTAMP": timestamp,
-        }
+        # Same signing as REST; load_private_key() parses the PEM once per process,
+        # so reconnects only pay for the RSA signature
+        return kalshi_headers("GET", WS_PATH)
+    
+    def _ws_open(self) -> bool:
+        """True if there is a connection in the OPEN state."""
+        return self.ws is not None and self.ws.state is State.OPEN
     
     def get_price(self, market_ticker: str) -> Optional[Dict[str, float]]:
         """Get current price from cache (thread-safe).
@@ -65,42 +133,83 @@ class KalshiWebSocketClient:
         Returns:
             Dictionary with yes_bid and yes_ask, or None if not available/stale
         """
-        with self.price_cache_lock:
-            price_data = self.price_cache.get(market_ticker)
-            if not price_data:
-                return None
-            
-            # Check if stale
-            last_update = price_data.get("last_update", 0)
-            if time.time() - last_update > settings.WEBSOCKET_PRICE_CACHE_STALE_SECS:
-                if settings.VERBOSE:
-                    print(f"⚠️ Price cache stale for {market_ticker}")
-                return None
-            
-            return {
-                "yes_bid": price_data.get("yes_bid"),
-                "yes_ask": price_data.get("yes_ask"),
-            }
+        history = self.price_history.get(market_ticker)
+        if not history:
+            return None
+        last_update, yes_bid, yes_ask = history[-1]
+        
+        # Check if stale
+        if time.monotonic_ns() - last_update > self._stale_ns:
+            logger.debug("⚠️ Price cache stale for %s", market_ticker)
+            return None
+        
+        return {
+            "yes_bid": yes_bid,
+            "yes_ask": yes_ask,
+        }
     
     def update_price_cache(self, market_ticker: str, yes_bid: Optional[float], yes_ask: Optional[float]):
-        """Update price cache with new data (thread-safe)."""
-        with self.price_cache_lock:
-            self.price_cache[market_ticker] = {
-                "yes_bid": yes_bid,
-                "yes_ask": yes_ask,
-                "last_update": time.time(),
-            }
+        """Append a tick to the market's price history (thread-safe: one atomic deque append)."""
+        tick = (time.monotonic_ns(), yes_bid, yes_ask)
+        try:
+            self.price_history[market_ticker].append(tick)
+        except KeyError:
+            self.price_history[market_ticker] = deque((tick,), maxlen=PRICE_HISTORY_LEN)
     
-    async def _subscribe_to_markets(self, market_tickers: List[str]):
-        """Subscribe to ticker updates for specific markets."""
+    def get_price_history(self, market_ticker: str) -> List[Tuple[int, Optional[float], Optional[float]]]:
+        """Recent (monotonic ns, yes_bid, yes_ask) ticks for a market, oldest first."""
+        history = self.price_history.get(market_ticker)
+        return list(history) if history else []
+    
+    def add_price_listener(self, listener: Callable[[str, Optional[float], Optional[float]], None]):
+        """Register a callback for live ticker updates (no-op if already registered)."""
+        if listener not in self.price_listeners:
+            self.price_listeners.append(listener)
+    
+    def register_order_waiter(self, order_id: str) -> threading.Event:
+        """Register interest in fills for order_id; the returned Event is set on each fill message."""
+        with self.order_lock:
+            event = self.order_waiters.get(order_id)
+            if event is None:
+                event = threading.Event()
+                self.order_waiters[order_id] = event
+            return event
+    
+    def unregister_order_waiter(self, order_id: str):
+        """Drop the waiter for order_id."""
+        with self.order_lock:
+            self.order_waiters.pop(order_id, None)
+    
+    def _handle_fill(self, fill_data: Dict[str, Any]):
+        """Wake any thread waiting on the filled order."""
+        order_id = fill_data.get("order_id")
+        if not order_id:
+            return
+        with self.order_lock:
+            event = self.order_waiters.get(order_id)
+        if event is None:
+            return
+        event.set()
+        logger.debug("📬 Fill pushed via WebSocket: order=%s count=%s", order_id, fill_data.get("count"))
+    
+    async def _subscribe_to_fills(self):
+        """Subscribe to the private fill channel so order waits are push-driven."""
         if not self.ws:
             return
-        
+        subscription = {
+            "id": self._get_next_message_id(),
+            "cmd": "subscribe",
+            "params": _FILL_SUB_PARAMS,
+        }
         try:
-            if self.ws.closed:
-                return
-        except AttributeError:
-            pass
+            await self.ws.send(fastjson.dumpb(subscription), text=True)
+        except Exception as e:
+            print(f"⚠️ Error subscribing to fill channel: {e}")
+    
+    async def _subscribe_to_markets(self, market_tickers: List[str]):
+        """Subscribe to ticker updates for specific markets."""
+        if not self._ws_open():
+            return
         
         if not market_tickers:
             return
@@ -110,25 +219,24 @@ class KalshiWebSocketClient:
             "id": self._get_next_message_id(),
             "cmd": "subscribe",
             "params": {
-                "channels": ["ticker"],  # Note: "channels" is plural, list format
+                "channels": _TICKER_CHANNELS,
                 "market_tickers": market_tickers
             }
         }
         
         try:
-            await self.ws.send(json.dumps(subscription))
+            await self.ws.send(fastjson.dumpb(subscription), text=True)
             with self.subscription_lock:
                 self.subscribed_markets.update(market_tickers)
             print(f"📡 Subscribed to ticker updates for {len(market_tickers)} markets: {', '.join(market_tickers[:5])}{'...' if len(market_tickers) > 5 else ''}")
         except Exception as e:
             print(f"⚠️ Error subscribing to markets: {e}")
             if settings.VERBOSE:
-                import traceback
                 traceback.print_exc()
     
     async def _unsubscribe_from_markets(self, market_tickers: List[str]):
         """Unsubscribe from ticker updates for specific markets."""
-        if not self.ws or self.ws.closed:
+        if not self._ws_open():
             return
         
         if not market_tickers:
@@ -139,15 +247,16 @@ class KalshiWebSocketClient:
         with self.subscription_lock:
             self.subscribed_markets.difference_update(market_tickers)
     
-    async def _process_message(self, message: str):
-        """Process incoming WebSocket message."""
+    async def _process_message(self, message: bytes):
+        """Process incoming WebSocket message (raw UTF-8 frame bytes or str)."""
         try:
-            data = json.loads(message)
+            data = fastjson.loads(message)
             msg_type = data.get("type")
+            # Payload is under "msg" (or "data" on older frames) for every message type
+            body = data.get("msg") or data.get("data") or {}
             
             if msg_type == "ticker":
-                # Handle ticker update (format: {"type": "ticker", "msg": {...}} or {"type": "ticker", "data": {...}})
-                ticker_data = data.get("msg") or data.get("data") or {}
+                ticker_data = body
                 market_ticker = ticker_data.get("market_ticker")
                 
                 if not market_ticker:
@@ -157,32 +266,37 @@ class KalshiWebSocketClient:
                 yes_bid_raw = ticker_data.get("yes_bid")
                 yes_ask_raw = ticker_data.get("yes_ask")
                 
-                yes_bid = format_price(yes_bid_raw) if yes_bid_raw is not None else None
-                yes_ask = format_price(yes_ask_raw) if yes_ask_raw is not None else None
+                # In-range integer cents (the normal case) skip the format_price() call;
+                # anything else (None, strings, out-of-range) goes through it for clamping
+                yes_bid = yes_bid_raw / 100.0 if type(yes_bid_raw) is int and 0 <= yes_bid_raw <= 100 else format_price(yes_bid_raw)
+                yes_ask = yes_ask_raw / 100.0 if type(yes_ask_raw) is int and 0 <= yes_ask_raw <= 100 else format_price(yes_ask_raw)
                 
                 # Update cache
                 self.update_price_cache(market_ticker, yes_bid, yes_ask)
+                for listener in self.price_listeners:
+                    try:
+                        listener(market_ticker, yes_bid, yes_ask)
+                    except Exception as e:
+                        logger.warning("⚠️ Price listener error for %s: %s", market_ticker, e)
                 
-                if settings.VERBOSE:
-                    print(f"📊 Price update: {market_ticker} | Bid: {yes_bid:.2% if yes_bid else 'N/A'} | Ask: {yes_ask:.2% if yes_ask else 'N/A'}")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("📊 Price update: %s | Bid: %s | Ask: %s", market_ticker, _pct(yes_bid), _pct(yes_ask))
+            
+            elif msg_type == "fill":
+                self._handle_fill(body)
             
             elif msg_type == "subscribed":
-                if settings.VERBOSE:
-                    print(f"✅ WebSocket subscription confirmed: {data}")
+                logger.debug("✅ WebSocket subscription confirmed: %s", data)
             
             elif msg_type == "error":
-                error_data = data.get("msg") or data.get("data") or {}
-                error_code = error_data.get("code")
-                error_msg = error_data.get("msg") or error_data.get("message")
-                print(f"❌ WebSocket error {error_code}: {error_msg}")
+                error_code = body.get("code")
+                error_msg = body.get("msg") or body.get("message")
+                logger.error("❌ WebSocket error %s: %s", error_code, error_msg)
             
         except json.JSONDecodeError as e:
-            print(f"⚠️ Error parsing WebSocket message: {e}")
+            logger.warning("⚠️ Error parsing WebSocket message: %s", e)
         except Exception as e:
-            print(f"⚠️ Error processing WebSocket message: {e}")
-            if settings.VERBOSE:
-                import traceback
-                traceback.print_exc()
+            logger.warning("⚠️ Error processing WebSocket message: %s", e, exc_info=settings.VERBOSE)
     
     async def _connection_loop(self):
         """Main WebSocket connection loop with reconnection."""
@@ -195,7 +309,7 @@ class KalshiWebSocketClient:
                     print(f"🔌 Connecting to Kalshi WebSocket: {settings.KALSHI_WS_URL}")
                 
                 # Connect to WebSocket
-                async with websockets.connect(
+                async with connect(
                     settings.KALSHI_WS_URL,
                     additional_headers=headers,
                     ping_interval=20,  # Send ping every 20 seconds
@@ -206,6 +320,9 @@ class KalshiWebSocketClient:
                     
                     print("✅ Connected to Kalshi WebSocket")
                     
+                    # Order fills are pushed on the private fill channel
+                    await self._subscribe_to_fills()
+                    
                     # Load initial prices for active positions via REST API
                     await self._load_initial_prices()
                     
@@ -213,48 +330,54 @@ class KalshiWebSocketClient:
                     await self._sync_subscriptions()
                     
                     # Process messages
+                    self.connected = True
                     try:
-                        async for message in websocket:
-                            if not self.running:
-                                break
+                        # decode=False hands text frames over as raw bytes, skipping the
+                        # UTF-8 decode to str that fastjson.loads doesn't need
+                        while self.running:
+                            message = await websocket.recv(decode=False)
                             await self._process_message(message)
                     except asyncio.CancelledError:
                         # Expected when shutting down
                         raise
-                    except websockets.exceptions.ConnectionClosed:
+                    except ConnectionClosed:
                         if self.running:
                             raise  # Re-raise to trigger reconnection
                         # Otherwise, we're shutting down - exit cleanly
                         break
+                    finally:
+                        # Order waiters fall back to REST polling while disconnected
+                        self.connected = False
             
-            except websockets.exceptions.ConnectionClosed:
+            except ConnectionClosed:
                 if self.running:
-                    print(f"⚠️ WebSocket connection closed, reconnecting in {self.reconnect_delay}s...")
-                    await asyncio.sleep(self.reconnect_delay)
-                    self.reconnect_delay = min(
-                        self.reconnect_delay * 2,
-                        settings.WEBSOCKET_MAX_RECONNECT_DELAY
-                    )
+                    print(f"⚠️ WebSocket connection closed, reconnecting in up to {self.reconnect_delay}s...")
+                    await self._reconnect_backoff()
             
             except Exception as e:
                 if self.running:
                     print(f"❌ WebSocket connection error: {e}")
                     if settings.VERBOSE:
-                        import traceback
                         traceback.print_exc()
-                    await asyncio.sleep(self.reconnect_delay)
-                    self.reconnect_delay = min(
-                        self.reconnect_delay * 2,
-                        settings.WEBSOCKET_MAX_RECONNECT_DELAY
-                    )
+                    await self._reconnect_backoff()
+    
+    async def _reconnect_backoff(self):
+        """Sleep before reconnecting, then double the delay (capped).
+        
+        Full jitter (uniform in [0, delay]) keeps many clients dropped by the same
+        server bounce from reconnecting in lockstep.
+        """
+        await asyncio.sleep(random.uniform(0, self.reconnect_delay))
+        self.reconnect_delay = min(
+            self.reconnect_delay * 2,
+            settings.WEBSOCKET_MAX_RECONNECT_DELAY
+        )
     
     async def _load_initial_prices(self):
         """Load initial prices for active positions via REST API before switching to WebSocket."""
         from kalshi.markets import get_kalshi_markets
         
-        # Get all active positions
-        with threading.RLock():  # Thread-safe access to state.positions
-            active_positions = [p for p in state.positions if not p.get("settled", False)]
+        active_positions = open_positions()
         
         if not active_positions:
             return
@@ -267,45 +390,52 @@ class KalshiWebSocketClient:
         # Group by event ticker to minimize API calls
         event_tickers = {p.get("event_ticker") for p in active_positions if p.get("event_ticker")}
         
-        for event_ticker in event_tickers:
-            try:
-                markets = get_kalshi_markets(event_ticker, force_live=True)
-                if not markets:
-                    continue
-                
-                # Update cache with initial prices
-                for market in markets:
-                    market_ticker = market.get("ticker")
-                    if not market_ticker or market_ticker not in market_tickers:
-                        continue
+        # Up to INITIAL_PRICE_CONCURRENCY requests in flight, with request starts spaced
+        # INITIAL_PRICE_MIN_INTERVAL apart to stay under the REST rate limit
+        loop = asyncio.get_running_loop()
+        sem = asyncio.Semaphore(INITIAL_PRICE_CONCURRENCY)
+        next_start = loop.time()
+        
+        async def load_event(event_ticker):
+            nonlocal next_start
+            async with sem:
+                now = loop.time()
+                start = max(now, next_start)
+                next_start = start + INITIAL_PRICE_MIN_INTERVAL
+                if start > now:
+                    await asyncio.sleep(start - now)
+                try:
+                    markets = await asyncio.to_thread(get_kalshi_markets, event_ticker, True)
+                    if not markets:
+                        return
                     
-                    yes_bid = format_price(market.get("yes_bid"))
-                    yes_ask = format_price(market.get("yes_ask"))
-                    self.update_price_cache(market_ticker, yes_bid, yes_ask)
+                    # Update cache with initial prices
+                    for market in markets:
+                        market_ticker = market.get("ticker")
+                        if not market_ticker or market_ticker not in market_tickers:
+                            continue
+                        
+                        yes_bid_raw = market.get("yes_bid")
+                        yes_ask_raw = market.get("yes_ask")
+                        yes_bid = yes_bid_raw / 100.0 if type(yes_bid_raw) is int and 0 <= yes_bid_raw <= 100 else format_price(yes_bid_raw)
+                        yes_ask = yes_ask_raw / 100.0 if type(yes_ask_raw) is int and 0 <= yes_ask_raw <= 100 else format_price(yes_ask_raw)
+                        self.update_price_cache(market_ticker, yes_bid, yes_ask)
                 
-                # Small delay to avoid rate limiting
-                await asyncio.sleep(0.25)
-            
-            except Exception as e:
-                if settings.VERBOSE:
-                    print(f"⚠️ Error loading initial prices for {event_ticker}: {e}")
+                except Exception as e:
+                    if settings.VERBOSE:
+                        print(f"⚠️ Error loading initial prices for {event_ticker}: {e}")
+        
+        await asyncio.gather(*(load_event(ev) for ev in event_tickers))
         
-        print(f"✅ Loaded initial prices for {len(self.price_cache)} markets")
+        print(f"✅ Loaded initial prices for {len(self.price_history)} markets")
     
     async def _sync_subscriptions(self):
         """Synchronize WebSocket subscriptions with active positions."""
-        if not self.ws:
+        if not self._ws_open():
             return
         
-        try:
-            if self.ws.closed:
-                return
-        except AttributeError:
-            pass  # Some websocket implementations don't have closed attribute
-        
-        # Get markets that need subscription (thread-safe)
-        with threading.RLock():
-            active_positions = [p for p in state.positions if not p.get("settled", False)]
+        # Get markets that need subscription
+        active_positions = open_positions()
         
         required_markets = {p.get("market_ticker") for p in active_positions if p.get("market_ticker")}
         
@@ -325,11 +455,23 @@ class KalshiWebSocketClient:
         if markets_to_unsubscribe:
             await self._unsubscribe_from_markets(markets_to_unsubscribe)
     
+    async def _subscription_worker(self):
+        """Run one _sync_subscriptions per burst of sync requests."""
+        while self.running:
+            await self._sub_dirty.wait()
+            await asyncio.sleep(SUBSCRIPTION_DEBOUNCE_SECS)
+            self._sub_dirty.clear()
+            try:
+                await self._sync_subscriptions()
+            except Exception as e:
+                if settings.VERBOSE:
+                    print(f"⚠️ Error syncing subscriptions: {e}")
+    
     def sync_subscriptions_sync(self):
-        """Synchronous wrapper to sync subscriptions from non-async context."""
-        if self.loop and self.loop.is_running() and not self.loop.is_closed():
+        """Request a subscription sync from non-async context (debounced on the client loop)."""
+        if self._sub_dirty is not None and self.loop and self.loop.is_running() and not self.loop.is_closed():
             try:
-                asyncio.run_coroutine_threadsafe(self._sync_subscriptions(), self.loop)
+                self.loop.call_soon_threadsafe(self._sub_dirty.set)
             except Exception as e:
                 if settings.VERBOSE:
                     print(f"⚠️ Error syncing subscriptions: {e}")
@@ -340,14 +482,19 @@ class KalshiWebSocketClient:
             print("⚠️ WebSocket disabled in configuration")
             return
         
+        _start_log_listener()
         self.running = True
         self.loop = asyncio.get_event_loop()
+        self._sub_dirty = asyncio.Event()
+        self._sub_task = asyncio.create_task(self._subscription_worker())
         self.connection_task = asyncio.create_task(self._connection_loop())
         await self.connection_task
     
     async def stop(self):
         """Stop WebSocket connection."""
         self.running = False
+        if self._sub_task and not self._sub_task.done():
+            self._sub_task.cancel()
         if self.connection_task and not self.connection_task.done():
             self.connection_task.cancel()
             try:
@@ -359,6 +506,7 @@ class KalshiWebSocketClient:
                 await self.ws.close()
             except Exception:
                 pass
+        _stop_log_listener()
         print("🔌 WebSocket connection closed")
 
 
@@ -405,7 +553,6 @@ def start_websocket_client():
         except Exception as e:
             print(f"❌ WebSocket thread error: {e}")
             if settings.VERBOSE:
-                import traceback
                 traceback.print_exc()
         finally:
             try:
@@ -419,7 +566,6 @@ def start_websocket_client():
                 pass
             except Exception:
                 if settings.VERBOSE:
-                    import traceback
                     traceback.print_exc()
             finally:
                 try:
@@ -2,12 +2,13 @@
 Position I/O utilities for saving and loading positions.
 """
 
-import json
 import os
 from pathlib import Path
 from typing import List, Dict, Any, Optional
 from config import settings
+from core import fastjson
 from app import state
+from execution.positions import normalize_loaded_positions
 
 
 def resolve_positions_file() -> Path:
@@ -15,12 +16,29 @@ def resolve_positions_file() -> Path:
     return settings.POSITIONS_FILE
 
 
+def write_atomic(path: Path, data: bytes):
+    """Write data to path via a fsynced temp file and rename, so a crash mid-write
+    never leaves a truncated file behind."""
+    tmp_file = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp_file, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_file, path)
+
+
 def save_positions():
-    """Save current positions to file."""
-    positions_file = resolve_positions_file()
+    """Save current positions to file (atomically; skipped if nothing changed since the last save).
+
+    Positions are mutated in place all over the bot, so "changed" is decided by
+    comparing the serialized bytes rather than a dirty flag that could be missed.
+    """
     try:
-        with open(positions_file, "w") as f:
-            json.dump(state.positions, f, indent=2)
+        data = fastjson.dumpb(state.positions, indent=True)
+        if data == state._last_saved_positions:
+            return
+        write_atomic(resolve_positions_file(), data)
+        state._last_saved_positions = data
     except Exception as e:
         print(f"⚠️ Failed to save positions: {e}")
 
@@ -31,10 +49,12 @@ def load_positions() -> List[Dict[str, Any]]:
     if not positions_file.exists():
         return []
     try:
-        with open(positions_file, "r") as f:
-            positions = json.load(f)
+        with open(positions_file, "rb") as f:
+            positions = fastjson.loads(f.read())
             if isinstance(positions, list):
                 state.positions = positions
+                state._last_saved_positions = None
+                normalize_loaded_positions()
                 return positions
             return []
     except Exception as e:
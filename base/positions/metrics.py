@@ -3,11 +3,25 @@ Position metrics and PnL calculations.
 """
 
 from typing import Tuple
+
+import numpy as np
+
 from config import settings
 from app import state
-from kalshi.markets import get_kalshi_markets, format_price
-from kalshi.fees import kalshi_fee_per_contract
+from execution.positions import open_positions
+from kalshi.fees import kalshi_fee_per_contract, kalshi_fees_vec
 from kalshi.balance import get_kalshi_balance
+from kalshi.prices import get_ws_client, yes_exit_price
+
+
+def _mark_to_market(entries, stakes, exits) -> float:
+    """Sum of stake * (exit - entry - maker exit fee) over parallel per-position lists."""
+    if not exits:
+        return 0.0
+    exits = np.asarray(exits, dtype=np.float64)
+    exit_fees = kalshi_fees_vec(1, exits, is_maker=True)
+    mtm_per_ct = (exits - np.asarray(entries, dtype=np.float64)) - exit_fees
+    return float(mtm_per_ct @ np.asarray(stakes, dtype=np.float64))
 
 
 def calculate_unrealized_pnl() -> Tuple[float, float]:
@@ -16,38 +30,36 @@ def calculate_unrealized_pnl() -> Tuple[float, float]:
     Returns:
         Tuple of (unrealized_pnl, total_equity)
     """
-    unreal = 0.0
+    ws_client = get_ws_client()
+    # Positions on the same event share one markets fetch per pass
+    event_markets = {}
+
+    # Parallel arrays for the open YES positions that have a mark; summed in one vectorized pass
+    entries, stakes, exits = [], [], []
 
-    for p in state.positions:
-        if p.get("settled", False):
+    for p in open_positions():
+        if p["side"] != "yes":
             continue
             
         try:
-            mkts = get_kalshi_markets(p.get("event_ticker", ""), force_live=True)
-            if not mkts:
-                continue
-            m = next((m for m in mkts if m.get("ticker") == p.get("market_ticker")), None)
-            if not m:
+            exit_price = yes_exit_price(p, ws_client, event_markets)
+            if exit_price is None:
                 continue
 
-            yes_bid = format_price(m.get("yes_bid"))
-            yes_ask = format_price(m.get("yes_ask"))
-
-            if (p.get("side") or "").lower() == "yes":
-                entry = float(p.get("effective_entry", p.get("entry_price", 0.0)))
-                exit_price = yes_bid if yes_bid is not None else yes_ask
-                if exit_price is None:
-                    continue
-
-                exit_fee = kalshi_fee_per_contract(exit_price, is_maker=True)
-                mtm_per_ct = (exit_price - entry) - exit_fee
-                unreal += float(p.get("stake", 0)) * mtm_per_ct
+            entry = p["effective_entry"]
+            stake = float(p.get("stake", 0))
 
         except Exception as e:
             if settings.VERBOSE:
                 print(f"⚠️ Error calculating PnL for position {p.get('market_ticker')}: {e}")
             continue
 
+        entries.append(entry)
+        stakes.append(stake)
+        exits.append(exit_price)
+
+    unreal = _mark_to_market(entries, stakes, exits)
+
     if settings.PLACE_LIVE_KALSHI_ORDERS == "YES":
         live_cash = get_kalshi_balance()
         equity = live_cash + unreal
@@ -60,22 +72,12 @@ def calculate_unrealized_pnl() -> Tuple[float, float]:
 def get_position_unrealized_pnl(position: dict) -> float:
     """Calculate unrealized PnL for a single position."""
     try:
-        mkts = get_kalshi_markets(position.get("event_ticker", ""), force_live=True)
-        if not mkts:
-            return 0.0
-        m = next((m for m in mkts if m.get("ticker") == position.get("market_ticker")), None)
-        if not m:
-            return 0.0
-
-        yes_bid = format_price(m.get("yes_bid"))
-        yes_ask = format_price(m.get("yes_ask"))
-
-        if (position.get("side") or "").lower() == "yes":
-            entry = float(position.get("effective_entry", position.get("entry_price", 0.0)))
-            exit_price = yes_bid if yes_bid is not None else yes_ask
+        if position["side"] == "yes":
+            exit_price = yes_exit_price(position, get_ws_client())
             if exit_price is None:
                 return 0.0
 
+            entry = position["effective_entry"]
             exit_fee = kalshi_fee_per_contract(exit_price, is_maker=True)
             mtm_per_ct = (exit_price - entry) - exit_fee
             return float(position.get("stake", 0)) * mtm_per_ct
@@ -88,14 +90,8 @@ def get_position_unrealized_pnl(position: dict) -> float:
 
 def get_total_exposure() -> float:
     """Calculate total current exposure across all positions."""
-    total = 0.0
-    for p in state.positions:
-        if p.get("settled", False):
-            continue
-        entry = float(p.get("effective_entry", p.get("entry_price", 0.0)))
-        stake = float(p.get("stake", 0))
-        total += entry * stake
-    return total
+    # Maintained incrementally by the execution.positions helpers
+    return state.total_exposure
 
 
 def get_position_summary() -> dict:
@@ -103,10 +99,8 @@ def get_position_summary() -> dict:
     unrealized_pnl, equity = calculate_unrealized_pnl()
     total_exposure = get_total_exposure()
     
-    open_positions = [p for p in state.positions if not p.get("settled", False)]
-    
     return {
-        "total_positions": len(open_positions),
+        "total_positions": len(open_positions()),
         "realized_pnl": state.realized_pnl,
         "unrealized_pnl": unrealized_pnl,
         "total_pnl": state.realized_pnl + unrealized_pnl,
@@ -2,42 +2,44 @@
 Position reconciliation with live Kalshi positions.
 """
 
-from typing import Dict, Any
+from typing import Any, Dict, List, Optional
 from app import state
 from config import settings
 from core.time import now_utc
 from kalshi.positions import get_live_positions
 from positions.io import save_positions
+from execution.positions import add_position, open_positions, position_key, set_position_stake, settle_position
 
 
-def reconcile_positions():
-    """Reconcile local positions with live Kalshi positions."""
-    try:
-        live = get_live_positions()
-    except Exception as e:
-        print(f"⚠️ Could not fetch live positions ({e}); continuing with local state")
-        live = []
+def reconcile_positions(live: Optional[List[Dict[str, Any]]] = None):
+    """Reconcile local positions with live Kalshi positions.
+    
+    Args:
+        live: Live positions already fetched this tick; fetched fresh if omitted
+    """
+    if live is None:
+        try:
+            live = get_live_positions(force=True)
+        except Exception as e:
+            print(f"⚠️ Could not fetch live positions ({e}); continuing with local state")
+            live = []
 
     live_now = now_utc().isoformat()
-    live_keys = {(lp["ticker"], (lp["side"] or "").lower()) for lp in live}
+    live_by_key = {(lp["ticker"], (lp["side"] or "").lower()): lp for lp in live}
 
     # Update last_seen for existing positions
     for p in state.positions:
-        key = (p.get("market_ticker"), (p.get("side") or "").lower())
-        if key in live_keys:
+        if position_key(p) in live_by_key:
             p["last_seen_live"] = live_now
 
     # Build local position keys
-    new_positions = list(state.positions)
-    local_keys = {(p.get("market_ticker"), (p.get("side") or "").lower()): i 
-                  for i, p in enumerate(new_positions)}
+    local_keys = frozenset(position_key(p) for p in state.positions)
 
     # Add new positions from Kalshi that we don't have locally
-    for lp in live:
-        key = (lp["ticker"], (lp["side"] or "").lower())
+    for key, lp in live_by_key.items():
         if key not in local_keys:
             print(f"✅ Added live fill from Kalshi: {lp['ticker']} {lp['side']}")
-            new_positions.append({
+            add_position({
                 "match": lp["ticker"],
                 "side": lp["side"].lower(),
                 "event_ticker": lp.get("event_ticker", ""),
@@ -51,15 +53,12 @@ def reconcile_positions():
 
     # Mark positions as settled if they no longer exist on Kalshi
     # Also handle partial fills for positions in closing state
-    for pos in new_positions:
-        if pos.get("settled", False):
-            continue
-
-        key = (pos.get("market_ticker"), (pos.get("side") or "").lower())
+    for pos in open_positions():
+        key = position_key(pos)
         
         # Check if position is in closing state - handle partial fills
         if pos.get("closing_in_progress", False):
-            live_pos = next((lp for lp in live if (lp["ticker"], (lp["side"] or "").lower()) == key), None)
+            live_pos = live_by_key.get(key)
             
             if live_pos:
                 live_qty = int(live_pos.get("contracts", 0))
@@ -71,15 +70,14 @@ def reconcile_positions():
                     print(f"📊 Partial fill detected via reconciliation: {pos.get('market_ticker')} - {filled_qty} filled, {live_qty} remaining")
                     
                     # Update position to reflect remaining contracts
-                    pos["stake"] = live_qty
+                    set_position_stake(pos, live_qty)
                     pos["closing_in_progress"] = False  # Reset to monitor remaining
                     pos["exit_order_id"] = None
                     
                     # If we have exit price info, calculate PnL
                     if pos.get("last_exit_price"):
                         from kalshi.fees import kalshi_fee_per_contract
-                        from app import state
-                        entry_price = float(pos.get("effective_entry", pos.get("entry_price", 0.0)))
+                        entry_price = pos["effective_entry"]
                         exit_price = pos["last_exit_price"]
                         
                         # Calculate PnL for filled portion
@@ -98,21 +96,21 @@ def reconcile_positions():
                             print(f"💰 Realized PnL for partial fill: {filled_qty} contracts = ${total_pnl:.2f}")
                 elif live_qty == 0:
                     # Fully filled - position gone
-                    pos["settled"] = True
+                    settle_position(pos)
                     pos["stake"] = 0
                     if settings.VERBOSE:
                         print(f"✅ Position fully exited: {pos.get('market_ticker')} {pos.get('side')}")
-            elif key not in live_keys:
+            elif key not in live_by_key:
                 # Position doesn't exist on Kalshi - fully settled
-                pos["settled"] = True
+                settle_position(pos)
                 pos["stake"] = 0
                 if settings.VERBOSE:
                     print(f"✅ Position fully settled: {pos.get('market_ticker')} {pos.get('side')}")
             continue
 
         # Position not in closing state - normal settlement check
-        if key not in live_keys:
-            pos["settled"] = True
+        if key not in live_by_key:
+            settle_position(pos)
             pos["stake"] = 0
             if settings.VERBOSE:
                 print(
@@ -120,5 +118,4 @@ def reconcile_positions():
                     "- no longer exists on Kalshi"
                 )
 
-    state.positions[:] = new_positions
     save_positions()
\ No newline at end of file
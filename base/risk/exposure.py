@@ -2,18 +2,52 @@
 Risk management for position exposure.
 """
 
-from typing import Optional, Tuple
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple
 from config import settings
 from app import state
 from positions.metrics import get_total_exposure
 from kalshi.balance import get_kalshi_balance
 
 
-def check_exposure_violation(additional_exposure: float = 0.0) -> Tuple[bool, str]:
+@dataclass
+class EngineContext:
+    """Per-tick snapshot for the strategy engine's risk checks.
+    
+    Built once per run_engine() call so checking every market doesn't re-read the
+    balance. event_exposure is state.event_exposure itself, which add_position()
+    keeps current as the engine opens positions.
+    """
+    equity: float
+    event_exposure: Dict[str, float] = field(default_factory=lambda: defaultdict(float))
+
+
+def current_equity() -> float:
+    """Equity the exposure limits are a percentage of (live balance or sim capital).
+    
+    get_kalshi_balance() serves repeat calls from its BALANCE_CACHE_SECS cache, and
+    run_engine reads this once per tick via EngineContext, so no extra cache here.
+    """
+    if settings.PLACE_LIVE_KALSHI_ORDERS == "YES":
+        return get_kalshi_balance()
+    return state.capital_sim
+
+
+def build_engine_context() -> EngineContext:
+    """Snapshot equity and attach the per-event exposure index."""
+    return EngineContext(
+        equity=current_equity(),
+        event_exposure=state.event_exposure,
+    )
+
+
+def check_exposure_violation(additional_exposure: float = 0.0, ctx: Optional[EngineContext] = None) -> Tuple[bool, str]:
     """Check if adding exposure would violate risk limits.
     
     Args:
         additional_exposure: Additional exposure to add (in dollars)
+        ctx: Per-tick snapshot to read equity from (fetched if omitted)
     
     Returns:
         Tuple of (is_violation, reason)
@@ -22,10 +56,7 @@ def check_exposure_violation(additional_exposure: float = 0.0) -> Tuple[bool, st
     total_exposure = current_exposure + additional_exposure
     
     # Get current equity
-    if settings.PLACE_LIVE_KALSHI_ORDERS == "YES":
-        equity = get_kalshi_balance()
-    else:
-        equity = state.capital_sim
+    equity = ctx.equity if ctx is not None else current_equity()
     
     # Check total exposure limit
     max_total_exposure = equity * settings.MAX_TOTAL_EXPOSURE_PCT
@@ -35,31 +66,23 @@ def check_exposure_violation(additional_exposure: float = 0.0) -> Tuple[bool, st
     return False, ""
 
 
-def check_event_exposure_violation(event_ticker: str, additional_exposure: float) -> Tuple[bool, str]:
+def check_event_exposure_violation(event_ticker: str, additional_exposure: float, ctx: Optional[EngineContext] = None) -> Tuple[bool, str]:
     """Check if adding exposure for an event would violate per-event limits.
     
     Args:
         event_ticker: Event ticker to check
         additional_exposure: Additional exposure to add (in dollars)
+        ctx: Per-tick snapshot with equity and per-event exposure (computed if omitted)
     
     Returns:
         Tuple of (is_violation, reason)
     """
-    # Calculate current exposure for this event
-    current_event_exposure = sum(
-        float(p.get("effective_entry", p.get("entry_price", 0.0))) * float(p.get("stake", 0))
-        for p in state.positions
-        if p.get("event_ticker") == event_ticker and not p.get("settled", False)
-    )
+    event_exposure = ctx.event_exposure if ctx is not None else state.event_exposure
+    current_event_exposure = event_exposure.get(event_ticker, 0.0)
+    equity = ctx.equity if ctx is not None else current_equity()
     
     total_event_exposure = current_event_exposure + additional_exposure
     
-    # Get current equity
-    if settings.PLACE_LIVE_KALSHI_ORDERS == "YES":
-        equity = get_kalshi_balance()
-    else:
-        equity = state.capital_sim
-    
     # Check per-event exposure limit
     max_event_exposure = equity * settings.MAX_EXPOSURE_PER_EVENT_PCT
     if total_event_exposure > max_event_exposure:
@@ -2,41 +2,130 @@
 Stop loss tracking and management.
 """
 
-import json
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, Any, Optional
 from config import settings
 from app import state
-from kalshi.markets import get_kalshi_markets, format_price
+from core import fastjson
 from positions.metrics import get_position_unrealized_pnl
-from positions.io import save_positions
+from kalshi.prices import event_market_index, get_ws_client, yes_exit_price
+from positions.io import save_positions, write_atomic
+from execution.positions import open_positions, set_position_stake
 
 
 STOP_LOSS_FILE = Path(settings.BASE_DIR) / "stop_loss_orders.json"
 
+# Max concurrent REST market fetches when several events miss the WebSocket cache
+STOP_LOSS_FETCH_WORKERS = 8
+
+# After a failed/unfilled exit attempt, leave the position alone this long before
+# retrying (p["exit_retry_after"], epoch seconds) - the old polling cadence
+EXIT_RETRY_SECS = settings.STOP_LOSS_CHECK_INTERVAL
+
+# Set from the WebSocket loop when a tick crosses a stop/take level; the stop loss
+# thread waits on it between polling passes
+_stop_loss_trigger = threading.Event()
+
+
+def on_price_update(market_ticker: str, yes_bid: Optional[float], yes_ask: Optional[float]):
+    """WebSocket price listener: wake the stop loss thread if this tick crosses a threshold.
+    
+    Runs on the WebSocket event loop, so it only compares prices and sets an Event;
+    check_stop_losses does the order placement on its own thread.
+    """
+    by_id = state.active_by_ticker.get(market_ticker)
+    if not by_id:
+        return
+    price = yes_bid if yes_bid is not None else yes_ask
+    if price is None:
+        return
+    now = time.time()
+    # Same conditions as check_stop_losses (long YES only)
+    for p in list(by_id.values()):
+        if p["side"] != "yes" or p.get("closing_in_progress", False) or p.get("exit_retry_after", 0.0) > now:
+            continue
+        stop_loss = p.get("stop_loss")
+        take_profit = p.get("take_profit")
+        if (stop_loss is not None and price <= stop_loss) or (take_profit is not None and price >= take_profit):
+            _stop_loss_trigger.set()
+            return
+
+
+def has_pending_exits() -> bool:
+    """True if any open position has an exit order resting or an exit retry pending.
+    
+    Both are only advanced by the polling pass (ticks arrive only on price changes),
+    so the stop loss thread keeps the fast STOP_LOSS_CHECK_INTERVAL while this holds.
+    """
+    now = time.time()
+    return any(
+        p.get("closing_in_progress", False) or p.get("exit_retry_after", 0.0) > now
+        for p in open_positions()
+    )
+
+
+def wait_for_stop_loss_trigger(timeout: float) -> bool:
+    """Block up to timeout for on_price_update to fire; True (and reset) if it did."""
+    if _stop_loss_trigger.wait(timeout):
+        _stop_loss_trigger.clear()
+        return True
+    return False
+
 
 def load_stop_loss_orders() -> Dict[str, Dict[str, Any]]:
     """Load stop loss orders from file."""
     if not STOP_LOSS_FILE.exists():
         return {}
     try:
-        with open(STOP_LOSS_FILE, "r") as f:
-            return json.load(f)
+        return fastjson.loads(STOP_LOSS_FILE.read_bytes())
     except Exception as e:
         print(f"⚠️ Failed to load stop loss orders: {e}")
         return {}
 
 
 def save_stop_loss_orders(stop_loss_orders: Dict[str, Dict[str, Any]]):
-    """Save stop loss orders to file."""
+    """Save stop loss orders to file (atomically, via temp file + rename)."""
     try:
-        with open(STOP_LOSS_FILE, "w") as f:
-            json.dump(stop_loss_orders, f, indent=2)
+        write_atomic(STOP_LOSS_FILE, fastjson.dumpb(stop_loss_orders, indent=True))
     except Exception as e:
         print(f"⚠️ Failed to save stop loss orders: {e}")
 
 
+def _prefetch_event_markets(positions, ws_client, event_markets: Dict[str, Dict[str, Dict[str, Any]]]):
+    """Fetch REST markets concurrently for every event with a WebSocket price miss.
+    
+    Only runs with STOP_LOSS_PARALLEL_FETCH and more than one such event; otherwise (or
+    for any event whose fetch fails) check_stop_losses fetches lazily, one at a time.
+    """
+    if not settings.STOP_LOSS_PARALLEL_FETCH:
+        return
+    missing = []
+    now = time.time()
+    for p in positions:
+        market_ticker = p.get("market_ticker")
+        if not market_ticker or p.get("closing_in_progress", False) or p.get("exit_retry_after", 0.0) > now:
+            continue
+        price_data = ws_client.get_price(market_ticker) if ws_client is not None else None
+        if not price_data or (price_data.get("yes_bid") is None and price_data.get("yes_ask") is None):
+            missing.append(p.get("event_ticker", ""))
+    event_tickers = list(dict.fromkeys(missing))
+    if len(event_tickers) <= 1:
+        return
+    
+    with ThreadPoolExecutor(max_workers=min(STOP_LOSS_FETCH_WORKERS, len(event_tickers))) as pool:
+        futures = {t: pool.submit(event_market_index, t) for t in event_tickers}
+    for event_ticker, future in futures.items():
+        try:
+            event_markets[event_ticker] = future.result()
+        except Exception as e:
+            if settings.VERBOSE:
+                print(f"⚠️ Error prefetching markets for {event_ticker}: {e}")
+
+
 def check_stop_losses():
     """Check all positions for stop loss triggers and execute exits if needed.
     Handles partial fills by tracking order IDs and resubmitting orders for remaining contracts.
@@ -44,12 +133,14 @@ def check_stop_losses():
     from kalshi.orders import prepare_kalshi_order, _extract_order_id, wait_for_fill_or_cancel, get_order_fill_status
     from core.time import now_utc
     
-    stop_loss_orders = load_stop_loss_orders()
+    ws_client = get_ws_client()
+    # event_ticker -> {market_ticker: market}, filled on first WebSocket miss per event so
+    # several positions in one event share a single REST fetch
+    event_markets: Dict[str, Dict[str, Dict[str, Any]]] = {}
+    positions = open_positions()
+    _prefetch_event_markets(positions, ws_client, event_markets)
     
-    for p in state.positions:
-        if p.get("settled", False):
-            continue
-        
+    for p in positions:
         market_ticker = p.get("market_ticker")
         if not market_ticker:
             continue
@@ -59,7 +150,7 @@ def check_stop_losses():
             exit_order_id = p.get("exit_order_id")
             if exit_order_id:
                 # Check if order has filled (fully or partially)
-                is_filled, filled_count, remaining_count = get_order_fill_status(exit_order_id)
+                is_filled, filled_count, remaining_count, _ = get_order_fill_status(exit_order_id)
                 
                 if is_filled and remaining_count == 0:
                     # Fully filled - will be handled by settlement
@@ -75,7 +166,7 @@ def check_stop_losses():
                         print(f"📊 Partial fill detected for {market_ticker}: {filled_count} filled, {remaining_stake} remaining")
                         
                         # Update position with remaining contracts
-                        p["stake"] = remaining_stake
+                        set_position_stake(p, remaining_stake)
                         p["partial_fills"] = p.get("partial_fills", [])
                         p["partial_fills"].append({
                             "qty": filled_count,
@@ -107,42 +198,22 @@ def check_stop_losses():
                 # This will be handled by reconcile_positions
                 continue
         
+        # Last exit attempt failed or didn't fill - wait out the retry delay
+        if p.get("exit_retry_after", 0.0) > time.time():
+            continue
+        
         stop_loss = p.get("stop_loss")
         take_profit = p.get("take_profit")
         
-        # Get current market price (prefer WebSocket cache, fallback to REST)
-        current_price = None
+        # Get current market price (WebSocket cache first, memoized per-event REST fallback)
         try:
-            # Try WebSocket cache first
-            from kalshi.websocket_client import get_websocket_client
-            ws_client = get_websocket_client()
-            price_data = ws_client.get_price(market_ticker)
-            
-            if price_data:
-                yes_bid = price_data.get("yes_bid")
-                yes_ask = price_data.get("yes_ask")
-                current_price = yes_bid if yes_bid is not None else yes_ask
-            
-            # Fallback to REST API if WebSocket cache unavailable
-            if current_price is None:
-                if settings.VERBOSE:
-                    print(f"⚠️ WebSocket price unavailable for {market_ticker}, using REST API fallback")
-                mkts = get_kalshi_markets(p.get("event_ticker", ""), force_live=True)
-                if not mkts:
-                    continue
-                m = next((m for m in mkts if m.get("ticker") == market_ticker), None)
-                if not m:
-                    continue
-                
-                yes_bid = format_price(m.get("yes_bid"))
-                yes_ask = format_price(m.get("yes_ask"))
-                current_price = yes_bid if yes_bid is not None else yes_ask
+            current_price = yes_exit_price(p, ws_client, event_markets)
             
             if current_price is None:
                 continue
             
-            side = (p.get("side") or "").lower()
-            entry_price = float(p.get("effective_entry", p.get("entry_price", 0.0)))
+            side = p["side"]
+            entry_price = p["effective_entry"]
             stake = int(p.get("stake", 0))
             
             if stake <= 0:
@@ -201,7 +272,7 @@ def check_stop_losses():
                                 print(f"📊 Partial fill on exit order: {market_ticker} - {filled_count} filled, {remaining_stake} remaining")
                                 
                                 # Update position
-                                p["stake"] = remaining_stake
+                                set_position_stake(p, remaining_stake)
                                 p["partial_fills"] = p.get("partial_fills", [])
                                 p["partial_fills"].append({
                                     "qty": filled_count,
@@ -223,10 +294,16 @@ def check_stop_losses():
                                 print(f"⚠️ Exit order {status} for {market_ticker}, will retry")
                             p["closing_in_progress"] = False
                             p["exit_order_id"] = None
+                            p["exit_retry_after"] = time.time() + EXIT_RETRY_SECS
                     else:
                         print(f"⚠️ Could not extract order ID for exit order on {market_ticker}")
                         # Don't mark as closing if we can't track the order
-                elif settings.PLACE_LIVE_KALSHI_ORDERS != "YES":
+                        p["exit_retry_after"] = time.time() + EXIT_RETRY_SECS
+                elif settings.PLACE_LIVE_KALSHI_ORDERS == "YES":
+                    # Order rejected or request failed - don't resend on every tick
+                    print(f"⚠️ Exit order failed for {market_ticker}, retrying in {EXIT_RETRY_SECS:.0f}s")
+                    p["exit_retry_after"] = time.time() + EXIT_RETRY_SECS
+                else:
                     # Simulation mode - mark as closing
                     p["closing_in_progress"] = True
                     p["exit_reason"] = exit_reason
@@ -248,7 +325,7 @@ def _realize_partial_fill(position: Dict[str, Any], filled_qty: int, exit_price:
         exit_price: Exit price for filled contracts
     """
     try:
-        entry_price = float(position.get("effective_entry", position.get("entry_price", 0.0)))
+        entry_price = position["effective_entry"]
         from kalshi.fees import kalshi_fee_per_contract
         
         # Calculate PnL per contract (simplified - assumes entry and exit at same fees)
@@ -8,8 +8,9 @@ from config import settings
 from app import state
 from kalshi.markets import get_kalshi_markets, market_yes_mid
 from kalshi.orders import safe_prepare_kalshi_order
-from risk.exposure import check_exposure_violation, check_event_exposure_violation, max_quantity_with_cap
+from risk.exposure import build_engine_context, check_exposure_violation, check_event_exposure_violation, max_quantity_with_cap
 from positions.io import save_positions
+from execution.positions import add_position
 from core.time import now_utc
 
 
@@ -57,6 +58,9 @@ def run_engine(active_matches: List[Dict[str, Any]]):
     
     print(f"🔄 Running strategy engine on {len(active_matches)} active matches...")
     
+    # Equity and per-event exposure snapshot shared by every market's risk checks
+    ctx = build_engine_context()
+    
     for match in active_matches:
         event_ticker = match.get("ticker")
         kalshi_markets = match.get("kalshi", [])
@@ -100,13 +104,13 @@ def run_engine(active_matches: List[Dict[str, Any]]):
             exposure = entry_price * quantity
             
             # Check total exposure
-            is_violation, reason = check_exposure_violation(exposure)
+            is_violation, reason = check_exposure_violation(exposure, ctx)
             if is_violation:
                 print(f"⚠️ Skipping trade due to exposure violation: {reason}")
                 continue
             
             # Check event exposure
-            is_violation, reason = check_event_exposure_violation(event_ticker, exposure)
+            is_violation, reason = check_event_exposure_violation(event_ticker, exposure, ctx)
             if is_violation:
                 print(f"⚠️ Skipping trade due to event exposure violation: {reason}")
                 continue
@@ -162,13 +166,13 @@ def run_engine(active_matches: List[Dict[str, Any]]):
                         "closing_in_progress": False,
                         "odds_prob": 0.5,
                     }
-                    state.positions.append(position)
+                    add_position(position)
                     state.METRICS["orders_placed"] += 1
                     continue
                 
                 # Quick initial check (asks typically fill in 1-2 seconds)
                 time.sleep(0.5)  # Brief pause for order to process
-                is_filled, filled_qty_immediate, remaining = get_order_fill_status(order_id)
+                is_filled, filled_qty_immediate, remaining, _ = get_order_fill_status(order_id)
                 
                 if is_filled and filled_qty_immediate >= quantity:
                     # Fully filled immediately - common when taking ask
@@ -229,7 +233,7 @@ def run_engine(active_matches: List[Dict[str, Any]]):
                     "odds_prob": 0.5,
                 }
                 
-                state.positions.append(position)
+                add_position(position)
                 state.METRICS["orders_placed"] += 1
                 state.METRICS["orders_filled"] += 1 if fill_status == "filled" else 0
                 if 0 < actual_filled < quantity:
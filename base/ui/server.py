@@ -15,6 +15,7 @@ from config import settings
 from app import state
 from app.loop import main as run_main_loop
 from positions.metrics import get_position_summary
+from execution.positions import open_positions
 from bot_logging.daily_reports import generate_daily_report
 
 app = FastAPI(
@@ -297,9 +298,7 @@ def api_status():
     
     # Get positions with unrealized PnL
     positions_data = []
-    for p in state.positions:
-        if p.get("settled", False):
-            continue
+    for p in open_positions():
         from positions.metrics import get_position_unrealized_pnl
         unrealized_pnl = get_position_unrealized_pnl(p)
         positions_data.append({
@@ -321,9 +320,7 @@ def api_status():
 def api_positions():
     """API endpoint to get detailed positions."""
     positions_data = []
-    for p in state.positions:
-        if p.get("settled", False):
-            continue
+    for p in open_positions():
         from positions.metrics import get_position_unrealized_pnl
         unrealized_pnl = get_position_unrealized_pnl(p)
         positions_data.append({
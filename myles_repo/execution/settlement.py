@@ -51,5 +51,7 @@ def realize_if_settled():
             print(f"⚠️ realize_if_settled error on {p.get('market_ticker')}: {e}")
             keep.append(p)
 
-    state.positions[:] = keep
-    save_positions()
+    # Only persist when a position actually settled this call
+    if len(keep) != len(state.positions):
+        state.positions[:] = keep
+        save_positions()